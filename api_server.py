@@ -0,0 +1,342 @@
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import signal
+import socket
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import crop_data
+import recommendation
+from coalescer import CropRequestCoalescer
+
+# Headless JSON API for the crop recommenders, so gateways can score farms
+# without going through a Streamlit session.
+#
+#   POST /recommend          one farm, app.py semantics (top 3 with analysis) on the exact inputs
+#   POST /recommend/batch    {"farms": [...]}, app.py semantics for each farm
+#   POST /crops              one farm, crop_data.predict_best_crops ("top_n", "explain")
+#   POST /crops/batch        {"farms": [...], "top_n": 3}, ranked crop names and scores
+#   POST /charts/suitability one farm, Plotly JSON of the top crop's radar chart
+#   GET  /health
+#
+# With --coalesce the server runs on asyncio instead of threads and
+# concurrent /crops requests are scored together in micro-batches.
+
+logger = logging.getLogger("varun.api")
+
+FARM_FIELDS = crop_data.FARM_INPUTS
+NUMERIC_FIELDS = ['ph', 'nitrogen', 'phosphorus', 'potassium', 'temperature', 'rainfall', 'humidity']
+LABEL_FIELDS = ['soil_type', 'region']
+
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+class BadRequest(Exception):
+    """Raised for request bodies that cannot be scored"""
+
+class RawJSON(str):
+    """A response body that is already serialized JSON"""
+
+def encode_body(body):
+    if isinstance(body, RawJSON):
+        return body.encode('utf-8')
+    return json.dumps(body, ensure_ascii=False).encode('utf-8')
+
+def parse_content_length(value):
+    """Body length from a Content-Length header value (0 if absent); BadRequest if malformed"""
+    value = (value or '0').strip()
+    # int() would also take '+5', ' 5' or '1_0', which are not valid header values
+    if not value.isdigit() or not value.isascii():
+        raise BadRequest("Content-Length must be a non-negative integer")
+    return int(value)
+
+def parse_farm(data):
+    """Validate one farm object and return its fields in FARM_FIELDS order"""
+    if not isinstance(data, dict):
+        raise BadRequest("each farm must be a JSON object")
+    missing = [field for field in FARM_FIELDS if field not in data]
+    if missing:
+        raise BadRequest(f"missing fields: {', '.join(missing)}")
+    farm = {field: data[field] for field in FARM_FIELDS}
+    for field in LABEL_FIELDS:
+        if not isinstance(farm[field], str):
+            raise BadRequest(f"'{field}' must be a string")
+    for field in NUMERIC_FIELDS:
+        try:
+            if isinstance(farm[field], bool):
+                raise TypeError
+            farm[field] = float(farm[field])
+        except (TypeError, ValueError):
+            raise BadRequest(f"'{field}' must be a number")
+        # json.loads accepts NaN and Infinity
+        if not math.isfinite(farm[field]):
+            raise BadRequest(f"'{field}' must be a finite number")
+    return farm
+
+def parse_farms(payload):
+    """Validate the 'farms' list of a batch request"""
+    farms = payload.get('farms') if isinstance(payload, dict) else None
+    if not isinstance(farms, list):
+        raise BadRequest("'farms' must be a list of farm objects")
+    return [parse_farm(farm) for farm in farms]
+
+def parse_top_n(payload, default=3):
+    top_n = payload.get('top_n', default)
+    if not isinstance(top_n, int) or isinstance(top_n, bool) or top_n < 1:
+        raise BadRequest("'top_n' must be a positive integer")
+    return top_n
+
+# The app's predict_best_crop snaps inputs to its slider steps to share cached
+# results; API clients send measured values, so they are scored as given.
+
+def recommend(payload):
+    farm = parse_farm(payload)
+    return [dict(rec.resolve()) for rec in recommendation.compute_best_crops(**farm)]
+
+def recommend_batch(payload):
+    return [[dict(rec.resolve()) for rec in recommendation.compute_best_crops(**farm)]
+            for farm in parse_farms(payload)]
+
+def crop_records(results, payload):
+    """Serialize lazy predict_best_crops results, with reasons and analysis unless 'explain' is false"""
+    if payload.get('explain', True):
+        return [dict(result.resolve()) for result in results]
+    return [dict(result) for result in results]
+
+def crops(payload):
+    farm = parse_farm(payload)
+    return crop_records(crop_data.predict_best_crops(**farm, top_n=parse_top_n(payload), lazy=True), payload)
+
+def crops_batch(payload):
+    farms = parse_farms(payload)
+    if not farms:
+        return []
+    columns = {field: [farm[field] for farm in farms] for field in FARM_FIELDS}
+    names, scores = crop_data.predict_best_crops_batch(columns, top_n=parse_top_n(payload))
+    return [{'crops': row_names, 'scores': row_scores}
+            for row_names, row_scores in zip(names.tolist(), scores.tolist())]
+
+def suitability_chart(payload):
+    # Imported here so scoring-only deployments do not need plotly
+    import charts
+    top = recommendation.compute_best_crops(**parse_farm(payload), top_n=1)[0]
+    return RawJSON(charts.suitability_chart_json(top['details'], top['crop']))
+
+ROUTES = {
+    '/recommend': recommend,
+    '/recommend/batch': recommend_batch,
+    '/crops': crops,
+    '/crops/batch': crops_batch,
+    '/charts/suitability': suitability_chart
+}
+
+def handle_post(path, body):
+    """Run the route for path on a JSON request body and return (status, response)"""
+    route = ROUTES.get(path)
+    if route is None:
+        return 404, {'error': f"unknown path {path}"}
+    try:
+        return 200, route(json.loads(body or b'{}'))
+    except (BadRequest, json.JSONDecodeError, UnicodeDecodeError) as e:
+        return 400, {'error': str(e)}
+    except Exception:
+        logger.exception("error handling %s", path)
+        return 500, {'error': "internal error"}
+
+class RecommendationHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive between requests
+    protocol_version = "HTTP/1.1"
+    server_version = "VarunAPI/1.0"
+    # Small responses on a kept-alive connection would otherwise wait on
+    # Nagle's algorithm and the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def send_json(self, status, body):
+        data = encode_body(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self.send_json(200, {'status': 'ok', 'pid': os.getpid()})
+        else:
+            self.send_json(404, {'error': f"unknown path {self.path}"})
+
+    def do_POST(self):
+        try:
+            length = parse_content_length(self.headers.get('Content-Length'))
+        except BadRequest as e:
+            # The body cannot be framed, so the connection cannot be reused
+            self.close_connection = True
+            self.send_json(400, {'error': str(e)})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self.send_json(413, {'error': "request body too large"})
+            return
+        self.send_json(*handle_post(self.path, self.rfile.read(length)))
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+class CoalescingServer:
+    """
+    Minimal asyncio HTTP/1.1 server for the same routes. /crops requests are
+    queued on a CropRequestCoalescer; other routes run directly.
+    """
+
+    def __init__(self, coalescer):
+        self.coalescer = coalescer
+
+    async def coalesced_crops(self, body):
+        try:
+            payload = json.loads(body or b'{}')
+            farm = parse_farm(payload)
+            results = await self.coalescer.predict_best_crops(**farm, top_n=parse_top_n(payload), lazy=True)
+            return 200, crop_records(results, payload)
+        except (BadRequest, json.JSONDecodeError, UnicodeDecodeError) as e:
+            return 400, {'error': str(e)}
+        except Exception:
+            logger.exception("error handling /crops")
+            return 500, {'error': "internal error"}
+
+    async def respond(self, method, path, body):
+        if method == 'GET':
+            if path == '/health':
+                return 200, {'status': 'ok', 'pid': os.getpid(),
+                             'batches': self.coalescer.batches, 'requests': self.coalescer.requests}
+            return 404, {'error': f"unknown path {path}"}
+        if method != 'POST':
+            return 405, {'error': f"unsupported method {method}"}
+        if path == '/crops':
+            return await self.coalesced_crops(body)
+        return handle_post(path, body)
+
+    async def handle_connection(self, reader, writer):
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                try:
+                    length = parse_content_length(headers.get('content-length'))
+                except BadRequest as e:
+                    status, response = 400, {'error': str(e)}
+                    keep_alive = False
+                else:
+                    if length > MAX_BODY_BYTES:
+                        status, response = 413, {'error': "request body too large"}
+                        keep_alive = False
+                    else:
+                        body = await reader.readexactly(length) if length else b''
+                        status, response = await self.respond(method, path, body)
+                data = encode_body(response)
+                head = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                        f"Content-Type: application/json; charset=utf-8\r\n"
+                        f"Content-Length: {len(data)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+                writer.write(head.encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, sock):
+        self.coalescer.start()
+        server = await asyncio.start_server(self.handle_connection, sock=sock)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.coalescer.close()
+
+def fork_workers(workers):
+    """
+    Fork workers - 1 extra processes that serve the already bound socket.
+    Returns the child pids in the parent and an empty list in the children.
+    """
+    children = []
+    if workers > 1 and not hasattr(os, 'fork'):
+        logger.warning("multiple workers need os.fork; serving with one process")
+        return children
+    for _ in range(workers - 1):
+        pid = os.fork()
+        if pid == 0:
+            return []
+        children.append(pid)
+    return children
+
+def serve(host="127.0.0.1", port=8000, workers=1, coalesce=False, max_batch_size=256, max_wait_ms=2.0):
+    """
+    Serve the API. With workers > 1 (POSIX only) the listening socket is
+    shared by forked worker processes, which inherit the loaded crop
+    catalog and score table instead of rebuilding them. With coalesce,
+    each worker runs the asyncio server and batches /crops requests.
+    """
+    recommendation.get_score_table()
+    # Shut down through the same path as Ctrl-C so workers are stopped too
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    if coalesce:
+        sock = socket.create_server((host, port))
+        children = fork_workers(workers)
+        logger.info("serving on http://%s:%d (pid %d, coalescing)", host, sock.getsockname()[1], os.getpid())
+        coalescer = CropRequestCoalescer(max_batch_size, max_wait_ms)
+        try:
+            asyncio.run(CoalescingServer(coalescer).serve(sock))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sock.close()
+            for pid in children:
+                os.kill(pid, signal.SIGTERM)
+        return
+
+    server = ThreadingHTTPServer((host, port), RecommendationHandler)
+    server.daemon_threads = True
+    children = fork_workers(workers)
+    logger.info("serving on http://%s:%d (pid %d)", host, server.server_address[1], os.getpid())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+
+def main():
+    parser = argparse.ArgumentParser(description="VARUN AI crop recommendation JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="worker processes sharing the socket")
+    parser.add_argument("--coalesce", action="store_true", help="batch concurrent /crops requests (asyncio server)")
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    serve(args.host, args.port, args.workers, args.coalesce, args.max_batch_size, args.max_wait_ms)
+
+if __name__ == "__main__":
+    main()
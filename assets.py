@@ -0,0 +1,190 @@
+import argparse
+import functools
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import time
+
+# Build step for the app's images. The logo and soil swatches are rendered
+# once (at deploy, or on the first start if no build exists), written under
+# content-hashed names and listed in a manifest. The app only reads the
+# manifest and never renders or probes for image files itself.
+#
+#   python assets.py            # writes assets/manifest.json and the images
+
+ASSET_DIR = "assets"
+MANIFEST_NAME = "manifest.json"
+FORMATS = ['png', 'webp']
+
+# Formats the app serves, best first
+PREFERRED_FORMATS = ['webp', 'png']
+
+# Soil labels used in the UI that differ from the soil class names
+SOIL_ALIASES = {'sandy': 'sand'}
+
+# How often get_manifest looks for a rebuilt manifest, in seconds
+MANIFEST_CHECK_INTERVAL = 5.0
+
+# Decoded, resized images kept in memory (asset x display width)
+IMAGE_CACHE_SIZE = 64
+
+_HASHED_NAME = re.compile(r'^.+\.[0-9a-f]{16}\.(png|webp)$')
+
+def _encode(img, fmt):
+    """Encode an image as optimized PNG or lossless WebP bytes"""
+    buffer = io.BytesIO()
+    if fmt == 'png':
+        img.save(buffer, 'PNG', optimize=True)
+    else:
+        # Lossless is about half the size of the PNG for these flat-colored images;
+        # the highest effort settings are ~100x slower for 1-2% smaller files
+        img.save(buffer, 'WEBP', lossless=True, quality=80, method=4)
+    return buffer.getvalue()
+
+def _write_atomic(path, data):
+    # Per-process name, so a CLI build and a starting app cannot clobber each other's file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def _write_hashed(asset_dir, stem, fmt, data):
+    """Write data as <stem>.<content hash>.<fmt> unless it exists; return the relative path"""
+    name = f"{stem}.{hashlib.blake2b(data, digest_size=8).hexdigest()}.{fmt}"
+    path = os.path.join(asset_dir, name)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_atomic(path, data)
+    return name
+
+def _prune(asset_dir, keep):
+    """Remove hashed files left over from earlier builds"""
+    for root, _, files in os.walk(asset_dir):
+        for name in files:
+            relative = os.path.relpath(os.path.join(root, name), asset_dir).replace(os.sep, '/')
+            if _HASHED_NAME.match(name) and relative not in keep:
+                os.remove(os.path.join(root, name))
+
+def build(asset_dir=ASSET_DIR, formats=FORMATS):
+    """Render every image, write the hashed files and the manifest, and return the manifest"""
+    import generate_images
+
+    images = {'logo': generate_images.generate_logo()}
+    for soil_type, img in generate_images.generate_soil_images().items():
+        images[f'soil/{soil_type}'] = img
+
+    entries = {}
+    for key, img in images.items():
+        stem = key.replace('soil/', 'soil_types/')
+        entry = {'width': img.width, 'height': img.height}
+        for fmt in formats:
+            entry[fmt] = _write_hashed(asset_dir, stem, fmt, _encode(img, fmt))
+        entries[key] = entry
+
+    listing = json.dumps(entries, sort_keys=True).encode('utf-8')
+    manifest = {'build': hashlib.blake2b(listing, digest_size=8).hexdigest(), 'assets': entries}
+    _write_atomic(os.path.join(asset_dir, MANIFEST_NAME), json.dumps(manifest, indent=2).encode('utf-8'))
+    _prune(asset_dir, {entry[fmt] for entry in entries.values() for fmt in formats})
+    return manifest
+
+def load_manifest(asset_dir=ASSET_DIR):
+    """Read the manifest, or return None if there is no complete build"""
+    try:
+        with open(os.path.join(asset_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    for entry in manifest.get('assets', {}).values():
+        for fmt in FORMATS:
+            if fmt in entry and not os.path.exists(os.path.join(asset_dir, entry[fmt])):
+                return None
+    return manifest
+
+def _manifest_mtime():
+    try:
+        return os.stat(os.path.join(ASSET_DIR, MANIFEST_NAME)).st_mtime_ns
+    except OSError:
+        return None
+
+_manifest = None
+_manifest_mtime_seen = None
+_manifest_checked = 0.0
+_manifest_lock = threading.Lock()
+
+def get_manifest():
+    """
+    The current manifest. It is read once per process and re-read when the
+    file changes, checked at most every MANIFEST_CHECK_INTERVAL seconds.
+    The first start builds the assets if there is no build yet.
+    """
+    global _manifest, _manifest_mtime_seen, _manifest_checked
+    if _manifest is not None and time.monotonic() - _manifest_checked < MANIFEST_CHECK_INTERVAL:
+        return _manifest
+    with _manifest_lock:
+        mtime = _manifest_mtime()
+        if _manifest is None or mtime != _manifest_mtime_seen:
+            _manifest = load_manifest() or build()
+            _manifest_mtime_seen = _manifest_mtime()
+        _manifest_checked = time.monotonic()
+    return _manifest
+
+def asset_path(key, formats=PREFERRED_FORMATS):
+    """Path of an asset in the first available format, or None if it is not in the build"""
+    entry = get_manifest()['assets'].get(key)
+    if entry is None:
+        return None
+    for fmt in formats:
+        if fmt in entry:
+            return os.path.join(ASSET_DIR, entry[fmt])
+    return None
+
+@functools.lru_cache(maxsize=IMAGE_CACHE_SIZE)
+def _image_bytes(build_id, key, width):
+    path = asset_path(key)
+    with open(path, 'rb') as f:
+        data = f.read()
+    if width is None:
+        return data
+
+    from PIL import Image
+    img = Image.open(io.BytesIO(data))
+    if img.width == width:
+        return data
+    resized = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+    return _encode(resized, os.path.splitext(path)[1][1:])
+
+_image_build = None
+
+def image_bytes(key, width=None):
+    """
+    Encoded bytes of an asset resized to width pixels (or at its own size),
+    served from memory after the first request. Returns None if the asset
+    is not in the build. A new build empties the cache.
+    """
+    global _image_build
+    manifest = get_manifest()
+    if manifest['build'] != _image_build:
+        _image_bytes.cache_clear()
+        _image_build = manifest['build']
+    if key not in manifest['assets']:
+        return None
+    return _image_bytes(manifest['build'], key, width)
+
+def soil_key(soil_type):
+    """Manifest key of the image for a soil label such as 'Sandy' or 'Clay Loam'"""
+    name = soil_type.lower().replace(' ', '_')
+    return f"soil/{SOIL_ALIASES.get(name, name)}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the app's image assets and manifest")
+    parser.add_argument("--dir", default=ASSET_DIR, help="output directory")
+    parser.add_argument("--formats", nargs="+", default=FORMATS, choices=FORMATS)
+    args = parser.parse_args()
+    manifest = build(args.dir, args.formats)
+    print(f"Built {len(manifest['assets'])} assets into {args.dir} ({manifest['build']})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import crop_catalog
+import crop_data
+import model
+import recommendation
+
+# Benchmarks for the three scorers: model (model.py), crop_data (crop_data.py,
+# also timed in its seasonal mode) and app (recommendation.py, the model
+# behind app.py). Farms are drawn from a fixed seed so runs are comparable;
+# --json writes a report to diff between releases. --legacy also times the
+# model scorer as it was before array scoring, to reproduce the baseline.
+
+SEED = 42
+
+# Sample farm used for the single-call benchmarks
+SAMPLE_FARM = {
+    'soil_type': 'Loam', 'ph': 6.5, 'nitrogen': 50, 'phosphorus': 40, 'potassium': 60,
+    'temperature': 25, 'rainfall': 800, 'humidity': 60
+}
+SAMPLE_REGION = 'Punjab'
+
+BATCH_SIZES = [1_000, 100_000, 1_000_000]
+
+# The app scorer has no batch API and is timed as a loop; larger sizes are skipped
+LOOP_MAX_FARMS = 100_000
+
+# Modules whose import time is measured in a fresh interpreter
+IMPORT_MODULES = ['crop_catalog', 'model', 'crop_data', 'recommendation']
+
+def make_farms(n, seed=SEED):
+    """Return n random farms on the app's slider grids as a dict of columns"""
+    rng = np.random.default_rng(seed)
+    soils = sorted({soil for soils in crop_catalog.SOIL_TYPES for soil in soils}) + ['Peaty']
+    regions = crop_data.REGION_NAMES + ['Select']
+    return {
+        'soil_type': np.asarray(soils, dtype=object)[rng.integers(0, len(soils), n)],
+        'ph': np.round(rng.uniform(4.0, 9.0, n), 1),
+        'nitrogen': rng.integers(0, 201, n),
+        'phosphorus': rng.integers(0, 201, n),
+        'potassium': rng.integers(0, 201, n),
+        'temperature': rng.integers(0, 46, n),
+        'rainfall': rng.integers(0, 2001, n),
+        'humidity': rng.integers(0, 101, n),
+        'region': np.asarray(regions, dtype=object)[rng.integers(0, len(regions), n)]
+    }
+
+def time_call(func, repeat=5, number=1000):
+    """Return the best per-call time of func in microseconds"""
+    timings = timeit.repeat(func, repeat=repeat, number=number)
+    return min(timings) / number * 1e6
+
+def bench_model():
+    """Per-call latency of model.predict_best_crop"""
+    return time_call(lambda: model.predict_best_crop(**SAMPLE_FARM))
+
+# The model's crop rows as the pre-array scorer had them, written out as literals
+LEGACY_COLUMNS = ['name', 'soil_type', 'ph_min', 'ph_max', 'temp_min', 'temp_max', 'rainfall_min', 'rainfall_max',
+                  'n_min', 'n_max', 'p_min', 'p_max', 'k_min', 'k_max']
+LEGACY_ROWS = crop_catalog.to_frame(model.MODEL_CROPS)[LEGACY_COLUMNS].to_dict('records')
+
+def legacy_predict_best_crop(soil_type, ph, nitrogen, phosphorus, potassium, temperature, rainfall, humidity):
+    """Best crop name as model.predict_best_crop found it before array scoring"""
+    crops_df = pd.DataFrame(LEGACY_ROWS)
+    scores = []
+    for _, crop in crops_df.iterrows():
+        score = 25 if crop['soil_type'] == soil_type else 0
+        for value, key, points, penalty in ((ph, 'ph', 20, 10), (temperature, 'temp', 15, 5),
+                                            (rainfall, 'rainfall', 15, 3), (nitrogen, 'n', 8, 2),
+                                            (phosphorus, 'p', 8, 2), (potassium, 'k', 9, 2)):
+            low, high = crop[f'{key}_min'], crop[f'{key}_max']
+            if low <= value <= high:
+                score += points
+            else:
+                score -= penalty * abs(value - (low + high) / 2)
+        scores.append(score)
+    crops_df['score'] = scores
+    return crops_df.loc[crops_df['score'].idxmax(), 'name']
+
+def bench_legacy_model():
+    """Per-call latency of the pre-array model scorer"""
+    return time_call(lambda: legacy_predict_best_crop(**SAMPLE_FARM))
+
+def bench_crop_data():
+    """Per-call latency of crop_data.predict_best_crops"""
+    return time_call(lambda: crop_data.predict_best_crops(**SAMPLE_FARM, region=SAMPLE_REGION))
+
+def bench_app():
+    """Per-call latency of the app scorer, uncached and on a result cache hit"""
+    uncached = time_call(lambda: recommendation.compute_best_crops(**SAMPLE_FARM, region=SAMPLE_REGION))
+    cached = time_call(lambda: recommendation.predict_best_crop(**SAMPLE_FARM, region=SAMPLE_REGION))
+    return uncached, cached
+
+def _app_loop(farms):
+    rows = zip(*(farms[field].tolist() for field in crop_data.FARM_INPUTS))
+    return [recommendation.compute_best_crops(*row) for row in rows]
+
+def _seasonal_batch(farms):
+    return crop_data.predict_best_crops_batch(farms, climate=crop_data.seasonal_climate(farms))
+
+# Batch entry point of each scorer
+BATCH_SCORERS = {
+    'model': model.predict_many,
+    'crop_data': crop_data.predict_best_crops_batch,
+    'seasonal': _seasonal_batch,
+    'app': _app_loop
+}
+
+def bench_batch(name, farms):
+    """Time one batch call and measure its peak traced memory in a second run"""
+    scorer = BATCH_SCORERS[name]
+    start = time.perf_counter()
+    scorer(farms)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    scorer(farms)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n = len(farms['ph'])
+    return {'seconds': round(seconds, 4), 'farms_per_s': round(n / seconds), 'peak_mb': round(peak / 2**20, 1)}
+
+def bench_import(module, repeat=3):
+    """Best wall time in ms to import module (and its dependencies) in a fresh interpreter"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    timings = [float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                    check=True).stdout) for _ in range(repeat)]
+    return round(min(timings) * 1000, 1)
+
+def run(sizes=BATCH_SIZES, legacy=False):
+    """Run every benchmark (and the legacy model scorer if asked) and return the report as a dict"""
+    app_uncached, app_cached = bench_app()
+    report = {
+        'seed': SEED,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'latency_us': {
+            'model': round(bench_model(), 1),
+            'crop_data': round(bench_crop_data(), 1),
+            'app': round(app_uncached, 1),
+            'app_cached': round(app_cached, 1)
+        },
+        'batch': {name: {} for name in BATCH_SCORERS},
+        'import_ms': {module: bench_import(module) for module in IMPORT_MODULES}
+    }
+    if legacy:
+        report['latency_us']['model_legacy'] = round(bench_legacy_model(), 1)
+    for size in sizes:
+        farms = make_farms(size)
+        for name in BATCH_SCORERS:
+            if name == 'app' and size > LOOP_MAX_FARMS:
+                report['batch'][name][str(size)] = None
+                continue
+            report['batch'][name][str(size)] = bench_batch(name, farms)
+    return report
+
+def print_report(report):
+    for name, latency in report['latency_us'].items():
+        print(f"{name:>14} latency: {latency:10.1f} us/call")
+    for name, results in report['batch'].items():
+        for size, result in results.items():
+            if result is None:
+                print(f"{name:>14} batch {int(size):>9,}: skipped (looped scorer)")
+            else:
+                print(f"{name:>14} batch {int(size):>9,}: {result['farms_per_s']:>12,} farms/s, "
+                      f"peak {result['peak_mb']:.1f} MB")
+    for module, ms in report['import_ms'].items():
+        print(f"{module:>14} import: {ms:10.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the crop scorers")
+    parser.add_argument("--sizes", type=int, nargs="+", default=BATCH_SIZES, help="batch sizes in farms")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    parser.add_argument("--legacy", action="store_true",
+                        help="also time the model scorer as it was before array scoring (the baseline)")
+    args = parser.parse_args()
+    report = run(args.sizes, args.legacy)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
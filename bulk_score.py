@@ -0,0 +1,255 @@
+import argparse
+import collections
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import crop_data
+
+# Streaming bulk scorer for soil-health-card exports. The input CSV is read
+# in chunks, each chunk is ranked with crop_data.predict_best_crops_batch and
+# the top N crops per row are appended to the output, so memory use depends
+# on the chunk size and not on the file size.
+#
+#   python bulk_score.py cards.csv ranked.csv --column ph=pH --column region=State \
+#       --fill temperature=25 --fill rainfall=800 --fill humidity=60 --fill soil_type=Loam
+#
+# With --seasonal, temperature, rainfall and humidity are scored over each
+# crop's growing season from the region's monthly climate normals; the
+# temperature, rainfall and humidity columns are only used for regions the
+# climate store does not have.
+#
+# Rows with a blank or non-numeric input cannot be ranked; their crop and
+# score columns are left blank and the count is reported at the end.
+#
+# With --workers N the chunks are scored as shards on N forked processes.
+# The workers inherit the crop tables already loaded in the parent instead
+# of receiving them with every task, and results are written in input order.
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Columns the scorer needs; missing ones must be mapped or filled
+INPUT_COLUMNS = ['soil_type', 'region'] + crop_data.FARM_COLUMNS
+
+def output_columns(top_n, keep=()):
+    """Column names of the output table"""
+    columns = ['row'] + list(keep)
+    for rank in range(1, min(top_n, len(crop_data.CROP_NAMES)) + 1):
+        columns += [f'crop_{rank}', f'score_{rank}']
+    return columns
+
+def read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, columns=None, fills=None, keep=()):
+    """
+    Yield DataFrames of INPUT_COLUMNS (plus the keep columns) from the CSV at
+    path. `columns` maps scorer column -> CSV column for inputs named
+    differently in the export; `fills` gives constant values for inputs the
+    export does not have.
+    """
+    columns = columns or {}
+    fills = fills or {}
+    header = pd.read_csv(path, nrows=0).columns
+    source = {name: columns.get(name, name) for name in INPUT_COLUMNS if name not in fills}
+    missing = [f"{name} ({csv_name})" if csv_name != name else name
+               for name, csv_name in source.items() if csv_name not in header]
+    missing += [name for name in keep if name not in header]
+    if missing:
+        raise ValueError(f"{path} has no column for: {', '.join(missing)}; use --column or --fill")
+
+    usecols = sorted(set(source.values()) | set(keep))
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunk_size):
+        farms = pd.DataFrame({name: chunk[csv_name].to_numpy() for name, csv_name in source.items()})
+        # Text in a numeric column ('n/a', '6,5') becomes NaN and leaves the row unranked
+        for name in crop_data.FARM_COLUMNS:
+            if name in source and not pd.api.types.is_numeric_dtype(farms[name]):
+                farms[name] = pd.to_numeric(farms[name], errors='coerce')
+        for name, value in fills.items():
+            farms[name] = value
+        for name in keep:
+            farms[name] = chunk[name].to_numpy()
+        farms.index = chunk.index
+        yield farms
+
+def score_chunk(farms, top_n=3, keep=(), seasonal=False):
+    """
+    Rank the crops for one chunk and return it in output_columns order.
+    Rows with missing inputs get blank crop and score columns.
+    """
+    climate = crop_data.seasonal_climate(farms) if seasonal else None
+    names, scores = crop_data.predict_best_crops_batch(farms, top_n=top_n, climate=climate)
+    # A missing input makes every score of the row NaN, so its ranking means nothing
+    names = np.where(np.isfinite(scores), names.astype(object), None)
+    ranked = {'row': farms.index.to_numpy()}
+    for name in keep:
+        ranked[name] = farms[name].to_numpy()
+    for rank in range(names.shape[1]):
+        ranked[f'crop_{rank + 1}'] = names[:, rank]
+        ranked[f'score_{rank + 1}'] = np.round(scores[:, rank], 2)
+    return pd.DataFrame(ranked)
+
+def _score_shard(farms, top_n, keep, as_csv, seasonal):
+    """Worker task: score one shard, returning its row count, invalid row count and output"""
+    ranked = score_chunk(farms, top_n, keep, seasonal)
+    invalid = int(ranked['crop_1'].isna().sum()) if 'crop_1' in ranked else 0
+    # Formatting CSV text is as expensive as scoring, so it is done in the worker too
+    return len(farms), invalid, ranked.to_csv(index=False, header=False) if as_csv else ranked
+
+def score_sharded(chunks, top_n=3, keep=(), workers=None, as_csv=False, seasonal=False):
+    """
+    Score an iterable of chunks on a process pool, yielding (rows, invalid, output)
+    in input order. At most two shards per worker are in flight, so memory
+    use stays bounded however many chunks there are.
+    """
+    workers = workers or os.cpu_count()
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+    with context.Pool(workers) as pool:
+        pending = collections.deque()
+        for farms in chunks:
+            pending.append(pool.apply_async(_score_shard, (farms, top_n, keep, as_csv, seasonal)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+class CsvWriter:
+    """Writes the header, then appends chunks (DataFrames or CSV text without header)"""
+
+    def __init__(self, path, columns):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.file.write(','.join(columns) + '\n')
+
+    def write(self, chunk):
+        if isinstance(chunk, str):
+            self.file.write(chunk)
+        else:
+            chunk.to_csv(self.file, header=False, index=False)
+
+    def close(self):
+        self.file.close()
+
+class ParquetWriter:
+    """
+    Appends chunks to a Parquet file as row groups (needs pyarrow). The
+    crop and score column types are fixed up front, since a chunk of
+    unranked rows would otherwise infer them as null.
+    """
+
+    def __init__(self, path, columns):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+        self._pa = pyarrow
+        self._parquet = pyarrow.parquet
+        self.path = path
+        self.columns = columns
+        self.writer = None
+
+    def _schema(self, table):
+        """Output schema: kept columns as the first chunk has them, the rest from output_columns"""
+        types = {'row': self._pa.int64()}
+        for name in self.columns:
+            if name.startswith('crop_'):
+                types[name] = self._pa.string()
+            elif name.startswith('score_'):
+                types[name] = self._pa.float64()
+        return self._pa.schema([self._pa.field(name, types.get(name, table.schema.field(name).type))
+                                for name in self.columns])
+
+    def write(self, frame):
+        table = self._pa.Table.from_pandas(frame, preserve_index=False)
+        if self.writer is None:
+            self.writer = self._parquet.ParquetWriter(self.path, self._schema(table))
+        self.writer.write_table(table.select(self.columns).cast(self.writer.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+def open_writer(path, columns):
+    """Pick the writer from the output file extension"""
+    if os.path.splitext(path)[1].lower() in ('.parquet', '.pq'):
+        return ParquetWriter(path, columns)
+    return CsvWriter(path, columns)
+
+def run(input_path, output_path, top_n=3, chunk_size=DEFAULT_CHUNK_SIZE,
+        columns=None, fills=None, keep=(), workers=1, progress=None, seasonal=False):
+    """
+    Score input_path into output_path chunk by chunk, on a pool of `workers`
+    processes if more than one. Calls progress(rows, seconds) after each
+    chunk and returns (rows, invalid rows, seconds) for the whole run.
+    """
+    if isinstance(top_n, bool) or not isinstance(top_n, int) or top_n < 1:
+        raise ValueError(f"top_n must be a positive integer, got {top_n!r}")
+    start = time.perf_counter()
+    rows = invalid = 0
+    chunks = read_chunks(input_path, chunk_size, columns, fills, keep)
+    writer = open_writer(output_path, output_columns(top_n, keep))
+    try:
+        if workers > 1:
+            results = score_sharded(chunks, top_n, keep, workers, as_csv=isinstance(writer, CsvWriter),
+                                    seasonal=seasonal)
+        else:
+            results = (_score_shard(farms, top_n, keep, False, seasonal) for farms in chunks)
+        for count, bad, output in results:
+            writer.write(output)
+            rows += count
+            invalid += bad
+            if progress:
+                progress(rows, time.perf_counter() - start)
+    finally:
+        writer.close()
+    return rows, invalid, time.perf_counter() - start
+
+def parse_assignments(items, numeric=False):
+    """Turn ['name=value', ...] into a dict"""
+    result = {}
+    for item in items or []:
+        name, sep, value = item.partition('=')
+        if not sep:
+            raise argparse.ArgumentTypeError(f"expected name=value, got '{item}'")
+        if numeric and name in crop_data.FARM_COLUMNS:
+            value = float(value)
+        result[name] = value
+    return result
+
+def report(rows, seconds, invalid=0):
+    print(f"{rows:,} rows in {seconds:.1f}s ({rows / max(seconds, 1e-9):,.0f} rows/s)", file=sys.stderr)
+    if invalid:
+        print(f"{invalid:,} rows not ranked: blank or non-numeric inputs", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank crops for every row of a soil-health-card CSV")
+    parser.add_argument("input", help="input CSV")
+    parser.add_argument("output", help="output .csv or .parquet")
+    parser.add_argument("--top-n", type=int, default=3)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--column", action="append", metavar="INPUT=CSV_COLUMN",
+                        help=f"read an input from a differently named column; inputs: {', '.join(INPUT_COLUMNS)}")
+    parser.add_argument("--fill", action="append", metavar="INPUT=VALUE",
+                        help="constant value for an input the CSV does not have")
+    parser.add_argument("--keep", action="append", default=[], metavar="CSV_COLUMN",
+                        help="copy a column (e.g. the card ID) to the output")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="score shards on this many processes (0 = one per CPU)")
+    parser.add_argument("--seasonal", action="store_true",
+                        help="score climate over each crop's season from the region's climate normals")
+    args = parser.parse_args()
+
+    try:
+        rows, invalid, seconds = run(args.input, args.output, args.top_n, args.chunk_size,
+                            parse_assignments(args.column), parse_assignments(args.fill, numeric=True),
+                            args.keep, args.workers or os.cpu_count(), progress=report,
+                            seasonal=args.seasonal)
+    except (ValueError, ImportError, argparse.ArgumentTypeError) as e:
+        parser.error(str(e))
+    print(f"Wrote {args.output}", file=sys.stderr)
+    report(rows, seconds, invalid)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import functools
+
+import plotly.graph_objects as go
+
+import scoring
+
+# Plotly figures for the app, memoized on their input values. Building and
+# validating a figure costs far more than the scoring behind it, and most
+# reruns redraw the same charts. Cached figures are shared between reruns
+# and sessions, so callers must not modify them.
+#
+# The app passes the cached figures straight to st.plotly_chart; the API
+# serves suitability_chart_json, which caches the serialized figure too.
+
+CHART_CACHE_SIZE = 256
+
+# Radar chart axes, in the order of a recommendation's 'details'
+SUITABILITY_FACTORS = ['regional_preference', 'soil_type', 'ph_suitability',
+                       'temperature_suitability', 'rainfall_suitability', 'nutrient_suitability']
+SUITABILITY_LABELS = ['Regional\nPreference', 'Soil Type\nMatch', 'pH\nSuitability',
+                      'Temperature\nSuitability', 'Rainfall\nSuitability', 'Nutrient\nSuitability']
+
+@functools.lru_cache(maxsize=CHART_CACHE_SIZE)
+def _suitability_figure(values, crop_name):
+    max_values = [scoring.MAX_POINTS[factor] for factor in SUITABILITY_FACTORS]
+
+    fig = go.Figure()
+
+    # Add actual values
+    fig.add_trace(go.Scatterpolar(
+        r=list(values),
+        theta=SUITABILITY_LABELS,
+        fill='toself',
+        name='Actual Suitability',
+        line_color='#4CAF50'
+    ))
+
+    # Add maximum possible values (for reference)
+    fig.add_trace(go.Scatterpolar(
+        r=max_values,
+        theta=SUITABILITY_LABELS,
+        fill='toself',
+        name='Maximum Possible',
+        line_color='#FF9800',
+        opacity=0.2
+    ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 30]  # Set range based on maximum value
+            )),
+        showlegend=True,
+        title=f"Suitability Analysis for {crop_name}"
+    )
+
+    return fig
+
+@functools.lru_cache(maxsize=CHART_CACHE_SIZE)
+def _suitability_json(values, crop_name):
+    return _suitability_figure(values, crop_name).to_json()
+
+def _suitability_key(details):
+    return tuple(float(details[factor]) for factor in SUITABILITY_FACTORS)
+
+def create_suitability_chart(details, crop_name):
+    """Radar chart of a recommendation's factor scores against their maximums"""
+    return _suitability_figure(_suitability_key(details), crop_name)
+
+def suitability_chart_json(details, crop_name):
+    """create_suitability_chart as pre-serialized Plotly JSON"""
+    return _suitability_json(_suitability_key(details), crop_name)
+
+@functools.lru_cache(maxsize=CHART_CACHE_SIZE)
+def _forecast_figure(dates, temperatures, rainfall, normal_temperatures=None):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=list(dates), y=list(temperatures), mode='lines+markers', name='Temperature (°C)', line=dict(color='#3B82F6')))
+    if normal_temperatures is not None:
+        fig.add_trace(go.Scatter(x=list(dates), y=list(normal_temperatures), mode='lines', name='Normal (°C)', line=dict(color='#9CA3AF', dash='dash')))
+    fig.add_trace(go.Bar(x=list(dates), y=list(rainfall), name='Rainfall (mm)', yaxis='y2', marker_color='#10B981'))
+
+    fig.update_layout(
+        title='7-Day Weather Forecast',
+        xaxis=dict(title='Date'),
+        yaxis=dict(title='Temperature (°C)', side='left', showgrid=False, color='#3B82F6'),
+        yaxis2=dict(title='Rainfall (mm)', side='right', overlaying='y', showgrid=False, color='#10B981'),
+        legend=dict(x=0, y=1.1, orientation='h'),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#374151')
+    )
+
+    return fig
+
+def create_forecast_chart(dates, temperatures, rainfall, normal_temperatures=None):
+    """Daily temperature line over rainfall bars, with the climate normal temperature if given"""
+    normals = None if normal_temperatures is None else tuple(map(float, normal_temperatures))
+    return _forecast_figure(tuple(dates), tuple(map(float, temperatures)), tuple(map(float, rainfall)), normals)
+
+def cache_info():
+    """lru_cache statistics for each chart cache"""
+    return {
+        'suitability': _suitability_figure.cache_info(),
+        'suitability_json': _suitability_json.cache_info(),
+        'forecast': _forecast_figure.cache_info()
+    }
+
+def cache_clear():
+    _suitability_figure.cache_clear()
+    _suitability_json.cache_clear()
+    _forecast_figure.cache_clear()
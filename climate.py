@@ -0,0 +1,240 @@
+import argparse
+import csv
+import datetime
+import json
+import logging
+import os
+import struct
+import threading
+
+import numpy as np
+
+# Daily climate normals per region: mean temperature (°C), rainfall (mm)
+# and relative humidity (%) for each day of the year. They are packed into
+# one binary file that is memory-mapped on first use, so a lookup is a view
+# into the page cache shared by every worker, with no parsing.
+#
+# File layout (little-endian):
+#   header   4s magic, H version, H days, H fields, H flags, I index length
+#   index    JSON {region key: record number}, padded to RECORD_ALIGN bytes
+#   records  float32 [days, fields] per region, one after another
+#
+# The store is built once at setup, not by the app:
+#
+#   python climate.py                       # synthetic normals from CLIMATE_PROFILES
+#   python climate.py --csv normals.csv     # measured region,day,temperature,rainfall,humidity rows
+#
+# Until then get_store() returns None and callers use the farm's own values.
+
+logger = logging.getLogger("varun.climate")
+
+DEFAULT_PATH = os.path.join("data", "climate_normals.bin")
+
+MAGIC = b'VCLN'
+VERSION = 1
+HEADER = struct.Struct('<4sHHHHI')
+RECORD_ALIGN = 64
+
+# Header flag: the normals were loaded from measurements, not CLIMATE_PROFILES
+MEASURED = 1
+
+# Days of a leap year, so 29 February has a row; other years skip it
+DAYS = 366
+FIELDS = ['temperature', 'rainfall', 'humidity']
+TEMPERATURE, RAINFALL, HUMIDITY = range(len(FIELDS))
+
+# Synthetic normals: approximate state climatology, not measurements, used
+# until measured normals are loaded with --csv. Mean temperature for each
+# month, annual rainfall, the day of year the wet season peaks and its
+# spread in days, and humidity in the dry and wet seasons.
+CLIMATE_PROFILES = {
+    'Punjab':         ([13, 16, 21, 27, 32, 33, 31, 30, 29, 25, 19, 14], 650, 205, 25, 45, 75),
+    'Haryana':        ([14, 17, 23, 29, 33, 34, 32, 31, 30, 26, 20, 15], 600, 205, 25, 45, 72),
+    'Uttar Pradesh':  ([16, 19, 25, 31, 34, 33, 30, 29, 29, 26, 21, 17], 950, 210, 30, 50, 80),
+    'Maharashtra':    ([22, 24, 28, 31, 32, 28, 26, 25, 26, 26, 23, 21], 1100, 200, 35, 50, 85),
+    'Karnataka':      ([22, 24, 27, 29, 28, 25, 24, 24, 24, 24, 23, 21], 1150, 200, 40, 55, 85),
+    'Tamil Nadu':     ([25, 26, 28, 31, 33, 32, 31, 30, 30, 28, 26, 25], 950, 310, 35, 65, 80),
+    'Andhra Pradesh': ([24, 26, 29, 32, 34, 32, 29, 29, 29, 28, 25, 23], 950, 235, 45, 60, 80),
+    'Gujarat':        ([20, 23, 27, 31, 33, 32, 29, 28, 29, 28, 24, 21], 800, 205, 25, 45, 80),
+    'Odisha':         ([21, 24, 28, 31, 32, 30, 28, 28, 28, 27, 24, 21], 1450, 215, 40, 65, 85),
+    'Jharkhand':      ([17, 20, 24, 28, 30, 28, 26, 25, 25, 24, 20, 17], 1300, 210, 35, 50, 85),
+    'West Bengal':    ([20, 23, 27, 30, 31, 30, 29, 29, 29, 28, 24, 20], 1750, 205, 40, 65, 88),
+    'Bihar':          ([16, 19, 25, 30, 32, 32, 30, 29, 29, 27, 22, 17], 1150, 210, 35, 55, 85)
+}
+
+# Share of the annual rainfall that falls in the wet season
+WET_SEASON_SHARE = 0.85
+
+def region_key(region):
+    return ' '.join(str(region).split()).lower()
+
+def day_index(date):
+    """Row of a date in a record: its day of year in a leap year, from 0"""
+    return datetime.date(2000, date.month, date.day).timetuple().tm_yday - 1
+
+# First row of each month in a record
+MONTH_STARTS = np.cumsum([0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30])
+MONTH_DAYS = np.diff(np.append(MONTH_STARTS, DAYS))
+
+def profile_normals(monthly_temp, annual_rain, wet_peak, wet_spread, dry_humidity, wet_humidity):
+    """[DAYS, FIELDS] daily normals from a CLIMATE_PROFILES entry"""
+    day = np.arange(DAYS)
+    # Monthly means sit mid-month; days in between are interpolated around the calendar
+    temperature = np.interp(day, MONTH_STARTS + MONTH_DAYS / 2, monthly_temp, period=DAYS)
+    # Distance to the wet-season peak around the calendar
+    offset = np.abs(day - wet_peak)
+    wet = np.exp(-0.5 * (np.minimum(offset, DAYS - offset) / wet_spread) ** 2)
+    rainfall = annual_rain * (WET_SEASON_SHARE * wet / wet.sum() + (1 - WET_SEASON_SHARE) / DAYS)
+    humidity = dry_humidity + (wet_humidity - dry_humidity) * wet
+    return np.stack([temperature, rainfall, humidity], axis=1)
+
+def read_csv(path):
+    """{region: [DAYS, FIELDS] normals} from a CSV with region, day (1-366) and FIELDS columns"""
+    normals = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            record = normals.setdefault(row['region'], np.full((DAYS, len(FIELDS)), np.nan))
+            record[int(row['day']) - 1] = [float(row[field]) for field in FIELDS]
+    for region, record in normals.items():
+        if np.isnan(record).any():
+            raise ValueError(f"{path}: {region} does not have all {DAYS} days")
+    return normals
+
+def write(normals, path=DEFAULT_PATH, measured=False):
+    """Pack {region: [DAYS, FIELDS] normals} into the file at path"""
+    index = {region_key(region): i for i, region in enumerate(normals)}
+    index_bytes = json.dumps(index, ensure_ascii=False).encode('utf-8')
+    index_bytes += b' ' * (-(HEADER.size + len(index_bytes)) % RECORD_ALIGN)
+    records = np.stack([np.asarray(record, dtype='<f4') for record in normals.values()])
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, DAYS, len(FIELDS), MEASURED if measured else 0, len(index_bytes)))
+        f.write(index_bytes)
+        f.write(records.tobytes())
+    os.replace(tmp, path)
+    return path
+
+def build(path=DEFAULT_PATH, csv_path=None):
+    """Write the store from a CSV of measured normals, or from CLIMATE_PROFILES"""
+    if csv_path:
+        return write(read_csv(csv_path), path, measured=True)
+    return write({region: profile_normals(*profile) for region, profile in CLIMATE_PROFILES.items()}, path)
+
+class ClimateNormals:
+    """
+    Read-only view of a normals file. The file is opened and mapped on the
+    first lookup; records are float32 [DAYS, FIELDS] views into the map.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._index = None
+        self._records = None
+        self._flags = 0
+        self._lock = threading.Lock()
+
+    def _open(self):
+        with self._lock:
+            if self._records is not None:
+                return
+            with open(self.path, 'rb') as f:
+                magic, version, days, fields, flags, index_length = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC or version != VERSION or (days, fields) != (DAYS, len(FIELDS)):
+                    raise ValueError(f"{self.path} is not a version {VERSION} climate normals file")
+                index = json.loads(f.read(index_length))
+            self._records = np.memmap(self.path, dtype='<f4', mode='r', offset=HEADER.size + index_length,
+                                      shape=(len(index), DAYS, len(FIELDS)))
+            self._flags = flags
+            self._index = index
+
+    @property
+    def synthetic(self):
+        """True if the normals come from CLIMATE_PROFILES rather than measurements"""
+        if self._records is None:
+            self._open()
+        return not self._flags & MEASURED
+
+    @property
+    def regions(self):
+        """Region keys in the store"""
+        if self._records is None:
+            self._open()
+        return list(self._index)
+
+    def __contains__(self, region):
+        if self._records is None:
+            self._open()
+        return region_key(region) in self._index
+
+    def daily(self, region):
+        """[DAYS, FIELDS] normals of a region (a view, not a copy); KeyError if unknown"""
+        if self._records is None:
+            self._open()
+        return self._records[self._index[region_key(region)]]
+
+    def window(self, region, start, days=7):
+        """[days, FIELDS] normals from the date start on; a view unless it crosses the year end"""
+        record = self.daily(region)
+        rows = [day_index(start + datetime.timedelta(days=i)) for i in range(days)]
+        # Contiguous unless the window crosses the year end or skips 29 February
+        if rows[-1] - rows[0] == days - 1:
+            return record[rows[0]:rows[0] + days]
+        return record[rows]
+
+    def monthly(self, region):
+        """[12, FIELDS] normals per calendar month: mean temperature and humidity, total rainfall"""
+        record = self.daily(region)
+        sums = np.add.reduceat(record, MONTH_STARTS, axis=0, dtype=np.float64)
+        months = sums / MONTH_DAYS[:, None]
+        months[:, RAINFALL] = sums[:, RAINFALL]
+        return months
+
+_store = None
+_store_lock = threading.Lock()
+_warned_missing = False
+
+def get_store(path=None):
+    """The process-wide store, or None if `python climate.py` has not built it yet"""
+    global _store, _warned_missing
+    path = path or DEFAULT_PATH
+    with _store_lock:
+        if _store is None:
+            if not os.path.exists(path):
+                if not _warned_missing:
+                    logger.warning("no climate normals at %s; run python climate.py to build them", path)
+                    _warned_missing = True
+                return None
+            _store = ClimateNormals(path)
+    return _store
+
+def baseline(region, start=None, days=7):
+    """
+    Daily normals for a region from start (today by default) as a list of
+    {'date', 'temperature', 'rainfall', 'humidity'}, or None if there is no
+    store or it has no such region.
+    """
+    store = get_store()
+    if store is None or region not in store:
+        return None
+    start = start or datetime.date.today()
+    window = store.window(region, start, days).tolist()
+    return [{'date': (start + datetime.timedelta(days=i)).isoformat(),
+             **{field: round(value, 1) for field, value in zip(FIELDS, row)}}
+            for i, row in enumerate(window)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the memory-mapped climate normals store")
+    parser.add_argument("--csv", help="measured normals: region,day,temperature,rainfall,humidity")
+    parser.add_argument("--output", default=DEFAULT_PATH)
+    args = parser.parse_args()
+    try:
+        path = build(args.output, args.csv)
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(str(e))
+    store = ClimateNormals(path)
+    print(f"Wrote {path} ({len(store.regions)} regions, {'synthetic' if store.synthetic else 'measured'})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import asyncio
+import math
+import numbers
+
+import crop_data
+
+# Inputs of crop_data.FARM_INPUTS that are labels; the rest are numbers
+LABEL_INPUTS = {'soil_type', 'region'}
+
+def validate_inputs(inputs, top_n):
+    """
+    Raise TypeError or ValueError for a request the batch scorer cannot take,
+    so a bad request fails on its own instead of inside a shared batch.
+    """
+    for field, value in zip(crop_data.FARM_INPUTS, inputs):
+        if field in LABEL_INPUTS:
+            if value is not None and not isinstance(value, str):
+                raise TypeError(f"{field} must be a string, got {type(value).__name__}")
+        elif isinstance(value, bool) or not isinstance(value, numbers.Real):
+            raise TypeError(f"{field} must be a number, got {type(value).__name__}")
+        elif not math.isfinite(value):
+            raise ValueError(f"{field} must be finite, got {value}")
+    if isinstance(top_n, bool) or not isinstance(top_n, int) or top_n < 1:
+        raise ValueError(f"top_n must be a positive integer, got {top_n!r}")
+
+class CropRequestCoalescer:
+    """
+    Collects concurrent predict_best_crops calls into micro-batches.
+
+    A batch is closed once it holds max_batch_size requests or max_wait_ms
+    after its first request arrived, whichever comes first. Every batch is
+    scored with one vectorized pass (crop_data.predict_best_crops_many) and
+    each caller gets back the same records predict_best_crops would return.
+    Requests are validated before they are queued, and if a batch still
+    fails its requests are scored one by one, so an error only reaches the
+    caller whose request caused it.
+    Scoring runs on the event loop thread; a batch takes well under a
+    millisecond, so that is cheaper than handing it to an executor.
+    """
+
+    def __init__(self, max_batch_size=256, max_wait_ms=2.0):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.requests = 0
+        self._queue = None
+        self._worker = None
+        # Requests taken off the queue for the batch being gathered or scored
+        self._batch = []
+
+    def start(self):
+        """Start the batching task on the running event loop"""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        """Stop the batching task; requests still queued or in an unscored batch are cancelled"""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        pending = self._batch
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, _, future in pending:
+            if not future.done():
+                future.cancel()
+        self._batch = []
+        self._worker = None
+
+    async def predict_best_crops(self, soil_type, ph, nitrogen, phosphorus, potassium,
+                                 temperature, rainfall, humidity, region, top_n=3, lazy=False):
+        """Coalesced equivalent of crop_data.predict_best_crops"""
+        inputs = (soil_type, ph, nitrogen, phosphorus, potassium, temperature, rainfall, humidity, region)
+        validate_inputs(inputs, top_n)
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((inputs, top_n, future))
+        # Batches are built lazily so only callers that want the text pay for it
+        results = await future
+        return results if lazy else [dict(result.resolve()) for result in results]
+
+    async def _next_batch(self):
+        """Wait for one request, then gather more until the batch is full or the wait runs out"""
+        loop = asyncio.get_running_loop()
+        self._batch = batch = []
+        batch.append(await self._queue.get())
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            # Callers that gave up while waiting are dropped from the batch
+            batch = [item for item in batch if not item[2].done()]
+            if not batch:
+                continue
+            self.batches += 1
+            self.requests += len(batch)
+            try:
+                results = crop_data.predict_best_crops_many([inputs for inputs, _, _ in batch],
+                                                            [top_n for _, top_n, _ in batch], lazy=True)
+            except Exception:
+                self._score_each(batch)
+            else:
+                for (_, _, future), result in zip(batch, results):
+                    future.set_result(result)
+
+    def _score_each(self, batch):
+        """Score a failed batch request by request so only the offending callers get the error"""
+        for inputs, top_n, future in batch:
+            try:
+                result = crop_data.predict_best_crops_many([inputs], [top_n], lazy=True)[0]
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+# Order of the growing-condition ranges in every catalog matrix
+RANGE_FACTORS = ['ph', 'temp', 'rainfall', 'humidity', 'n', 'p', 'k']
+
+# Optimal growing conditions for each crop. This is the only copy of the crop
+# thresholds; crop_data, model, data_loader and app all read from it.
+# name, soil types (preferred first), then one (min, max) pair per RANGE_FACTORS entry
+_CROP_TABLE = [
+    ('Wheat', ['Loam', 'Clay Loam'], (6.0, 7.5), (10, 25), (500, 1000), (40, 80), (50, 80), (30, 60), (40, 70)),
+    ('Rice', ['Clay', 'Clay Loam'], (5.0, 6.5), (20, 35), (1000, 2000), (60, 100), (60, 90), (40, 70), (50, 80)),
+    ('Maize', ['Loam', 'Sandy Loam'], (5.5, 7.0), (15, 30), (600, 1200), (50, 80), (70, 100), (50, 80), (60, 90)),
+    ('Cotton', ['Sandy', 'Sandy Loam'], (5.5, 7.5), (20, 35), (500, 800), (40, 70), (40, 70), (30, 60), (50, 80)),
+    ('Soybean', ['Silt', 'Silt Loam'], (6.0, 7.0), (15, 30), (600, 1000), (50, 85), (30, 60), (40, 70), (50, 80)),
+    ('Pulses', ['Loam', 'Sandy Loam'], (6.0, 7.5), (15, 30), (500, 800), (40, 70), (20, 50), (30, 60), (40, 70)),
+    ('Sugarcane', ['Loam', 'Clay Loam'], (6.0, 7.5), (20, 35), (1000, 1500), (60, 85), (100, 150), (50, 80), (80, 120)),
+    ('Groundnut', ['Sandy', 'Sandy Loam'], (5.5, 7.0), (20, 35), (500, 1000), (50, 80), (20, 40), (30, 50), (40, 60))
+]
+
+def _build_records():
+    """Build the per-crop dict records used for text generation"""
+    records = []
+    for name, soil_types, *ranges in _CROP_TABLE:
+        record = {'name': name, 'soil_type': soil_types[0], 'soil_types': soil_types}
+        for factor, (low, high) in zip(RANGE_FACTORS, ranges):
+            record[f'{factor}_min'] = low
+            record[f'{factor}_max'] = high
+        records.append(record)
+    return records
+
+def _build_catalog():
+    """Pack the crop table into a structured array with midpoints and range widths"""
+    fields = [('name', 'U16'), ('soil_type', 'U16')]
+    for factor in RANGE_FACTORS:
+        fields += [(f'{factor}_min', 'f8'), (f'{factor}_max', 'f8'),
+                   (f'{factor}_mid', 'f8'), (f'{factor}_width', 'f8')]
+    rows = []
+    for name, soil_types, *ranges in _CROP_TABLE:
+        row = [name, soil_types[0]]
+        for low, high in ranges:
+            row += [low, high, (low + high) / 2, high - low]
+        rows.append(tuple(row))
+    catalog = np.array(rows, dtype=fields)
+    catalog.flags.writeable = False
+    return catalog
+
+def _matrix(suffix):
+    """Stack one field per RANGE_FACTORS entry into a read-only (n_crops, n_factors) matrix"""
+    matrix = np.column_stack([CATALOG[f'{factor}_{suffix}'] for factor in RANGE_FACTORS])
+    matrix.flags.writeable = False
+    return matrix
+
+# Loaded once at import
+RECORDS = _build_records()
+CATALOG = _build_catalog()
+CROP_NAMES = [record['name'] for record in RECORDS]
+SOIL_TYPES = [record['soil_types'] for record in RECORDS]
+RANGE_MIN = _matrix('min')
+RANGE_MAX = _matrix('max')
+RANGE_MID = _matrix('mid')
+RANGE_WIDTH = _matrix('width')
+
+# Integer codes for crops and soil types. Scorers encode farm labels once
+# and then index these matrices instead of comparing strings per crop.
+CROP_INDEX = {name: i for i, name in enumerate(CROP_NAMES)}
+SOIL_NAMES = sorted({soil for soils in SOIL_TYPES for soil in soils})
+SOIL_INDEX = {soil: i for i, soil in enumerate(SOIL_NAMES)}
+SOIL_INDEX_LOWER = {soil.lower(): i for soil, i in SOIL_INDEX.items()}
+
+def _soil_matrix(preferred_only):
+    """Read-only (n_soils + 1, n_crops) bool matrix; the last row is for unknown soil types"""
+    matrix = np.zeros((len(SOIL_NAMES) + 1, len(CROP_NAMES)), dtype=bool)
+    for crop, soils in enumerate(SOIL_TYPES):
+        for soil in soils[:1] if preferred_only else soils:
+            matrix[SOIL_INDEX[soil], crop] = True
+    matrix.flags.writeable = False
+    return matrix
+
+# Soil x crop: the soil is one a crop grows in / is the crop's preferred soil
+SOIL_COMPATIBLE = _soil_matrix(preferred_only=False)
+SOIL_PREFERRED = _soil_matrix(preferred_only=True)
+
+def encode(labels, index, lower=False, codes=False):
+    """
+    Integer codes of an array of labels: index[label], or len(index) for
+    labels not in it (the unknown row of the matrices above). Each distinct
+    label is looked up once, so integers are labels like any other. With
+    codes, `labels` already holds codes and only out-of-range ones are
+    mapped to unknown. With lower, string labels are lowercased first (for
+    SOIL_INDEX_LOWER).
+    """
+    labels = np.asarray(labels).reshape(-1)
+    unknown = len(index)
+    if codes:
+        if labels.dtype.kind not in 'iu':
+            raise TypeError(f"codes must be an integer array, not {labels.dtype}")
+        return np.where((labels >= 0) & (labels < unknown), labels, unknown).astype(np.intp)
+    factorized, uniques = pd.factorize(labels.astype(object))
+    lookup = np.fromiter((index.get(label.lower() if lower and isinstance(label, str) else label, unknown)
+                          for label in uniques), dtype=np.intp, count=len(uniques))
+    # factorize gives -1 for missing labels, which picks the trailing unknown code
+    return np.append(lookup, unknown)[factorized]
+
+def to_frame(names=None):
+    """Return the catalog as a DataFrame, optionally limited to the given crop names"""
+    crops_df = pd.DataFrame(CATALOG)
+    crops_df['soil_types'] = SOIL_TYPES
+    if names is not None:
+        crops_df = crops_df[crops_df['name'].isin(names)].reset_index(drop=True)
+    return crops_df
+
+# Below this many crops a full sort is cheaper than a partial selection
+FULL_SORT_MAX_CROPS = 32
+
+def top_k(scores, k):
+    """
+    Indices of the k highest scores along the last axis, best first. Ties
+    are broken in catalog order, exactly like a stable descending sort, but
+    only the k selected crops are sorted.
+    """
+    scores = np.asarray(scores)
+    # NaN scores (farms with missing inputs) rank last, in catalog order
+    if scores.dtype.kind == 'f' and np.isnan(scores).any():
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+    k = min(k, scores.shape[-1])
+    if scores.shape[-1] <= FULL_SORT_MAX_CROPS:
+        return np.argsort(-scores, axis=-1, kind='stable')[..., :k]
+    kth = -np.partition(-scores, k - 1, axis=-1)[..., k - 1:k]
+    greater = scores > kth
+    ties = scores == kth
+    take = greater | (ties & (np.cumsum(ties, axis=-1) <= k - greater.sum(axis=-1, keepdims=True)))
+    picked = np.nonzero(take)[-1].reshape(scores.shape[:-1] + (k,))
+    order = np.argsort(-np.take_along_axis(scores, picked, axis=-1), axis=-1, kind='stable')
+    return np.take_along_axis(picked, order, axis=-1)
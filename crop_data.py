@@ -1,5 +1,12 @@
+import functools
+
 import numpy as np
 
+import climate
+import crop_catalog
+from lazy_record import LazyRecord
+from market import estimate_yield_and_price
+
 # Regional crop preferences with weights
 REGIONAL_PREFERENCES = {
     "Punjab": {"Wheat": 0.9, "Rice": 0.8, "Cotton": 0.7, "Maize": 0.6, "Sugarcane": 0.5},
@@ -16,97 +23,8 @@ REGIONAL_PREFERENCES = {
     "Bihar": {"Rice": 0.9, "Wheat": 0.8, "Maize": 0.7, "Pulses": 0.6, "Sugarcane": 0.5}
 }
 
-# Crop data with optimal conditions
-CROPS = [
-    {
-        'name': 'Wheat', 
-        'soil_types': ['Loam', 'Clay Loam'], 
-        'ph_min': 6.0, 'ph_max': 7.5,
-        'temp_min': 10, 'temp_max': 25, 
-        'rainfall_min': 500, 'rainfall_max': 1000,
-        'n_min': 50, 'n_max': 80, 
-        'p_min': 30, 'p_max': 60, 
-        'k_min': 40, 'k_max': 70,
-        'humidity_min': 40, 'humidity_max': 80
-    },
-    {
-        'name': 'Rice', 
-        'soil_types': ['Clay', 'Clay Loam'], 
-        'ph_min': 5.0, 'ph_max': 6.5,
-        'temp_min': 20, 'temp_max': 35, 
-        'rainfall_min': 1000, 'rainfall_max': 2000,
-        'n_min': 60, 'n_max': 90, 
-        'p_min': 40, 'p_max': 70, 
-        'k_min': 50, 'k_max': 80,
-        'humidity_min': 60, 'humidity_max': 100
-    },
-    {
-        'name': 'Maize', 
-        'soil_types': ['Loam', 'Sandy Loam'], 
-        'ph_min': 5.5, 'ph_max': 7.0,
-        'temp_min': 15, 'temp_max': 30, 
-        'rainfall_min': 600, 'rainfall_max': 1200,
-        'n_min': 70, 'n_max': 100, 
-        'p_min': 50, 'p_max': 80, 
-        'k_min': 60, 'k_max': 90,
-        'humidity_min': 50, 'humidity_max': 80
-    },
-    {
-        'name': 'Cotton', 
-        'soil_types': ['Sandy', 'Sandy Loam'], 
-        'ph_min': 5.5, 'ph_max': 7.5,
-        'temp_min': 20, 'temp_max': 35, 
-        'rainfall_min': 500, 'rainfall_max': 800,
-        'n_min': 40, 'n_max': 70, 
-        'p_min': 30, 'p_max': 60, 
-        'k_min': 50, 'k_max': 80,
-        'humidity_min': 40, 'humidity_max': 70
-    },
-    {
-        'name': 'Soybean', 
-        'soil_types': ['Silt', 'Silt Loam'], 
-        'ph_min': 6.0, 'ph_max': 7.0,
-        'temp_min': 15, 'temp_max': 30, 
-        'rainfall_min': 600, 'rainfall_max': 1000,
-        'n_min': 30, 'n_max': 60, 
-        'p_min': 40, 'p_max': 70, 
-        'k_min': 50, 'k_max': 80,
-        'humidity_min': 50, 'humidity_max': 85
-    },
-    {
-        'name': 'Pulses', 
-        'soil_types': ['Loam', 'Sandy Loam'], 
-        'ph_min': 6.0, 'ph_max': 7.5,
-        'temp_min': 15, 'temp_max': 30, 
-        'rainfall_min': 500, 'rainfall_max': 800,
-        'n_min': 20, 'n_max': 50, 
-        'p_min': 30, 'p_max': 60, 
-        'k_min': 40, 'k_max': 70,
-        'humidity_min': 40, 'humidity_max': 70
-    },
-    {
-        'name': 'Sugarcane', 
-        'soil_types': ['Loam', 'Clay Loam'], 
-        'ph_min': 6.0, 'ph_max': 7.5,
-        'temp_min': 20, 'temp_max': 35, 
-        'rainfall_min': 1000, 'rainfall_max': 1500,
-        'n_min': 100, 'n_max': 150, 
-        'p_min': 50, 'p_max': 80, 
-        'k_min': 80, 'k_max': 120,
-        'humidity_min': 60, 'humidity_max': 85
-    },
-    {
-        'name': 'Groundnut', 
-        'soil_types': ['Sandy', 'Sandy Loam'], 
-        'ph_min': 5.5, 'ph_max': 7.0,
-        'temp_min': 20, 'temp_max': 35, 
-        'rainfall_min': 500, 'rainfall_max': 1000,
-        'n_min': 20, 'n_max': 40, 
-        'p_min': 30, 'p_max': 50, 
-        'k_min': 40, 'k_max': 60,
-        'humidity_min': 50, 'humidity_max': 80
-    }
-]
+# Crop data with optimal conditions, read from the shared crop catalog
+CROPS = crop_catalog.RECORDS
 
 # Additional crop information
 PLANTING_TIMES = {
@@ -163,13 +81,14 @@ def calculate_suitability_score(crop, soil_type, ph, nitrogen, phosphorus, potas
     
     # Regional preference (weight: 25%)
     regional_weight = 0.25
-    regional_score = REGIONAL_PREFERENCES.get(region, {}).get(crop['name'], 0.5)
+    crop_code = crop_catalog.CROP_INDEX[crop['name']]
+    regional_score = float(REGION_WEIGHTS[REGION_INDEX.get(region, len(REGION_NAMES)), crop_code])
     score += regional_score * 100 * regional_weight
     reasons.append(f"Regional suitability: {regional_score*100:.1f}%")
     
     # Soil type match (weight: 20%)
     soil_weight = 0.20
-    if soil_type and soil_type in crop['soil_types']:
+    if SOIL_MATCH[SOIL_INDEX.get(soil_type, len(SOIL_NAMES)), crop_code]:
         soil_score = 1.0
     else:
         soil_score = 0.3  # Some crops can grow in other soils with reduced yield
@@ -239,40 +158,66 @@ def calculate_suitability_score(crop, soil_type, ph, nitrogen, phosphorus, potas
     
     return score, reasons
 
+# Farm inputs of predict_best_crops, in argument order
+FARM_INPUTS = ['soil_type', 'ph', 'nitrogen', 'phosphorus', 'potassium',
+               'temperature', 'rainfall', 'humidity', 'region']
+
 def predict_best_crops(soil_type, ph, nitrogen, phosphorus, potassium, 
-                      temperature, rainfall, humidity, region, top_n=3):
+                      temperature, rainfall, humidity, region, top_n=3, lazy=False):
     """
-    Predict the best crops based on input parameters
+    Predict the best crops based on input parameters. All crops are scored
+    numerically first and the reasons and analysis text are only built for
+    the top N. With lazy, the records are LazyRecords that build that text
+    when it is first read.
     """
+    inputs = (soil_type, ph, nitrogen, phosphorus, potassium, temperature, rainfall, humidity, region)
+    farm = {field: [value] for field, value in zip(FARM_INPUTS, inputs)}
+    scores = calculate_suitability_scores(farm)['score'][0]
+    return _build_recommendations(inputs, scores, top_n, lazy)
+
+def predict_best_crops_many(farms, top_n=3, lazy=False):
+    """
+    Run predict_best_crops for a list of farms with one vectorized scoring
+    pass. Each farm is a tuple of FARM_INPUTS values; top_n is an int or a
+    list with one value per farm.
+    """
+    if not farms:
+        return []
+    top_ns = top_n if isinstance(top_n, list) else [top_n] * len(farms)
+    scores = calculate_suitability_scores(dict(zip(FARM_INPUTS, zip(*farms))))['score']
+    return [_build_recommendations(inputs, row, n, lazy) for inputs, row, n in zip(farms, scores, top_ns)]
+
+def suitability_reasons(crop, *inputs):
+    """The reasons calculate_suitability_score gives for a crop"""
+    return calculate_suitability_score(crop, *inputs)[1]
+
+def _build_recommendations(inputs, scores, top_n, lazy=False):
+    """Build the result records for the top N crops of one farm's score row"""
     results = []
     
-    for crop in CROPS:
-        score, reasons = calculate_suitability_score(
-            crop, soil_type, ph, nitrogen, phosphorus, potassium,
-            temperature, rainfall, humidity, region
-        )
-        
-        # Generate detailed analysis
-        analysis = generate_detailed_analysis(crop, soil_type, ph, nitrogen, phosphorus, potassium,
-                                            temperature, rainfall, humidity, region)
+    # Rounded so crops with equal scores tie and keep catalog order
+    for i in crop_catalog.top_k(np.round(scores, 9), top_n):
+        crop = CROPS[i]
+        crop_yield, market_price = estimate_yield_and_price(crop['name'], inputs)
         
-        results.append({
+        # Reasons and detailed analysis are only generated when first read
+        record = LazyRecord({
             'crop': crop['name'],
-            'score': score,
-            'reasons': reasons,
-            'analysis': analysis,
-            'yield': f"{np.random.uniform(2.0, 5.0):.1f}",
+            'score': float(scores[i]),
+            'yield': f"{crop_yield:.1f}",
             'planting_time': PLANTING_TIMES.get(crop['name'], 'Varies by region'),
             'water_req': WATER_REQUIREMENTS.get(crop['name'], 'Moderate'),
             'fertilizer': FERTILIZER_RECOMMENDATIONS.get(crop['name'], 'N:P:K = 50:50:50 kg/ha'),
             'harvest_time': HARVEST_TIMES.get(crop['name'], 'Varies by region'),
-            'market_price': f"₹{np.random.randint(25, 55)}",
+            'market_price': f"₹{market_price}",
             'demand_trend': 'High' if crop['name'] in ['Rice', 'Wheat'] else 'Moderate' if crop['name'] in ['Maize', 'Cotton'] else 'Stable'
+        }, {
+            'reasons': functools.partial(suitability_reasons, crop, *inputs),
+            'analysis': functools.partial(generate_detailed_analysis, crop, *inputs)
         })
+        results.append(record if lazy else dict(record.resolve()))
     
-    # Sort by score and return top N results
-    results.sort(key=lambda x: x['score'], reverse=True)
-    return results[:top_n]
+    return results
 
 def generate_detailed_analysis(crop, soil_type, ph, nitrogen, phosphorus, potassium,
                              temperature, rainfall, humidity, region):
@@ -342,3 +287,164 @@ def generate_detailed_analysis(crop, soil_type, ph, nitrogen, phosphorus, potass
     analysis.append("Nutrient status: " + ", ".join(nutrient_status) + ".")
     
     return analysis
+
+# Column order of the crop range matrices used by the batch scorer
+RANGE_FACTORS = crop_catalog.RANGE_FACTORS
+
+# Farm profile columns accepted by the batch scorer, in RANGE_FACTORS order
+FARM_COLUMNS = ['ph', 'temperature', 'rainfall', 'humidity', 'nitrogen', 'phosphorus', 'potassium']
+
+CROP_NAMES = crop_catalog.CROP_NAMES
+CROP_MIN = crop_catalog.RANGE_MIN
+CROP_MAX = crop_catalog.RANGE_MAX
+
+# Distance at which a sub-score falls to zero (same as calculate_suitability_score)
+FALLOFF = np.array([3, 15, 500, 30, 50, 40, 40], dtype=float)
+
+# Region x crop preference matrix, last row is the default for unknown regions
+REGION_NAMES = list(REGIONAL_PREFERENCES)
+REGION_INDEX = {region: i for i, region in enumerate(REGION_NAMES)}
+REGION_WEIGHTS = np.array(
+    [[REGIONAL_PREFERENCES[region].get(name, 0.5) for name in CROP_NAMES] for region in REGION_NAMES]
+    + [[0.5] * len(CROP_NAMES)]
+)
+
+# Soil type x crop compatibility matrix, last row is for unknown or missing soil types
+SOIL_NAMES = crop_catalog.SOIL_NAMES
+SOIL_INDEX = crop_catalog.SOIL_INDEX
+SOIL_MATCH = crop_catalog.SOIL_COMPATIBLE
+
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December']
+
+def _month_span(text):
+    """(first, last) month numbers from 0 of a 'June-July' style range"""
+    names = [name.strip() for name in text.split('-')]
+    return MONTHS.index(names[0]), MONTHS.index(names[-1])
+
+def _season_months(crop_name):
+    """
+    Months from the start of planting to the end of harvest, wrapping
+    around the year. A harvest window that overlaps the planting window
+    (as for sugarcane) means the crop stands for a full year; crops
+    without a known season are scored over every month.
+    """
+    if crop_name not in PLANTING_TIMES or crop_name not in HARVEST_TIMES:
+        return list(range(12))
+    plant_first, plant_last = _month_span(PLANTING_TIMES[crop_name])
+    harvest_last = _month_span(HARVEST_TIMES[crop_name])[1]
+    length = (harvest_last - plant_first) % 12 + 1
+    if length <= (plant_last - plant_first) % 12 + 1:
+        length = 12
+    return [(plant_first + i) % 12 for i in range(length)]
+
+# Crop x month mask of each crop's planting-to-harvest window, and the same
+# rows normalized to sum to 1 for averaging monthly sub-scores over it
+SEASON_MASK = np.array([[month in _season_months(name) for month in range(12)] for name in CROP_NAMES], dtype=float)
+SEASON_WEIGHTS = SEASON_MASK / SEASON_MASK.sum(axis=1, keepdims=True)
+
+# Columns of the monthly climate arrays used by the seasonal scorer
+CLIMATE_COLUMNS = ['temperature', 'rainfall', 'humidity']
+
+def _range_score(x, low, high, falloff):
+    """1 inside [low, high], falling linearly to 0 at falloff beyond the nearest bound"""
+    # Worked in place: for monthly inputs these are (N, 12, n_crops) arrays
+    distance = low - x
+    np.maximum(distance, x - high, out=distance)
+    distance *= -1 / falloff
+    distance += 1
+    return np.clip(distance, 0, 1, out=distance)
+
+def seasonal_climate(farms):
+    """
+    (N, 12, 3) monthly mean temperature, rainfall total and mean humidity
+    for N farms from their region's climate normals (climate.py). Rows of
+    regions the store does not have, or every row if it has not been built,
+    are NaN; calculate_suitability_scores scores those farms on their own
+    temperature, rainfall and humidity.
+    """
+    regions = np.asarray(farms['region'], dtype=object).reshape(-1)
+    months = np.full((len(regions), 12, len(CLIMATE_COLUMNS)), np.nan)
+    store = climate.get_store()
+    known = np.array([store is not None and isinstance(region, str) and region in store for region in regions],
+                     dtype=bool)
+    for region in set(regions[known]):
+        months[regions == region] = store.monthly(region)[:, [climate.FIELDS.index(c) for c in CLIMATE_COLUMNS]]
+    return months
+
+def _seasonal_factor_scores(climate):
+    """
+    Temperature, rainfall and humidity sub-scores, (N, n_crops) each, over
+    every crop's season: monthly temperature and humidity scores averaged
+    over the season's months, and the season's total rainfall against the
+    crop's range.
+    """
+    climate = np.asarray(climate, dtype=float)
+    temperature = _range_score(climate[..., 0, None], CROP_MIN[:, 1], CROP_MAX[:, 1], FALLOFF[1])
+    humidity = _range_score(climate[..., 2, None], CROP_MIN[:, 3], CROP_MAX[:, 3], FALLOFF[3])
+    season_rainfall = climate[..., 1] @ SEASON_MASK.T
+    return (np.einsum('nmc,cm->nc', temperature, SEASON_WEIGHTS),
+            _range_score(season_rainfall, CROP_MIN[:, 2], CROP_MAX[:, 2], FALLOFF[2]),
+            np.einsum('nmc,cm->nc', humidity, SEASON_WEIGHTS))
+
+def calculate_suitability_scores(farms, climate=None):
+    """
+    Score N farm profiles against every crop at once.
+
+    `farms` is a DataFrame or a mapping of column name to array with the
+    FARM_COLUMNS plus 'soil_type' and 'region' labels; labels missing from
+    REGION_INDEX or SOIL_INDEX score as unknown. Returns a dict of (N, n_crops)
+    sub-score arrays in the 0-1 range and the weighted 'score' in 0-100.
+
+    With `climate`, an (N, 12, 3) array of monthly CLIMATE_COLUMNS (see
+    seasonal_climate), temperature, rainfall and humidity are scored over
+    each crop's planting-to-harvest season instead of against the single
+    values in `farms`. Rows of `climate` with a NaN fall back to the values
+    in `farms`, which may be left out if no row does.
+    """
+    values = np.column_stack([np.asarray(farms[column], dtype=float)
+                              if climate is None or column not in CLIMATE_COLUMNS or column in farms
+                              else np.full(len(climate), np.nan) for column in FARM_COLUMNS])
+    x = values[:, None, :]
+    inside = (CROP_MIN <= x) & (x <= CROP_MAX)
+
+    # pH, temperature, rainfall and humidity fall off with the distance to the nearest bound
+    bound_distance = np.maximum(np.maximum(CROP_MIN - x, x - CROP_MAX), 0)
+    # Nutrients fall off with the distance to the middle of the range
+    mid_distance = np.abs(x - crop_catalog.RANGE_MID)
+    distance = np.concatenate([bound_distance[..., :4], mid_distance[..., 4:]], axis=-1)
+    factor_scores = np.where(inside, 1.0, np.maximum(0, 1 - distance / FALLOFF))
+
+    regions = crop_catalog.encode(farms['region'], REGION_INDEX)
+    soil_types = crop_catalog.encode(farms['soil_type'], SOIL_INDEX)
+
+    scores = {
+        'regional': REGION_WEIGHTS[regions],
+        'soil': np.where(SOIL_MATCH[soil_types], 1.0, 0.3),
+        'ph': factor_scores[..., 0],
+        'temperature': factor_scores[..., 1],
+        'rainfall': factor_scores[..., 2],
+        'humidity': factor_scores[..., 3],
+        'nutrient': factor_scores[..., 4:].mean(axis=-1)
+    }
+    if climate is not None:
+        seasonal = ~np.isnan(climate).any(axis=(1, 2))[:, None]
+        for column, seasonal_scores in zip(CLIMATE_COLUMNS, _seasonal_factor_scores(climate)):
+            scores[column] = np.where(seasonal, seasonal_scores, scores[column])
+    score = (scores['regional'] * 25 + scores['soil'] * 20 + scores['ph'] * 15
+             + scores['temperature'] * 15 + scores['rainfall'] * 10
+             + scores['humidity'] * 5 + scores['nutrient'] * 10)
+    scores['score'] = np.clip(score, 0, 100)
+    return scores
+
+def predict_best_crops_batch(farms, top_n=3, climate=None):
+    """
+    Rank the crops for N farm profiles at once, by season if climate is
+    given (see calculate_suitability_scores).
+
+    Returns a (N, top_n) array of crop names and the matching (N, top_n) scores,
+    best first.
+    """
+    score = calculate_suitability_scores(farms, climate)['score']
+    order = crop_catalog.top_k(np.round(score, 9), top_n)
+    return np.asarray(CROP_NAMES, dtype=object)[order], np.take_along_axis(score, order, axis=1)
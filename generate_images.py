@@ -1,75 +1,117 @@
-import os
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
-def generate_soil_images():
+# Rendering of the app's image assets. assets.py writes them to disk with
+# content-hashed names and a manifest; run `python assets.py` to rebuild.
+
+# Base color of each soil class
+SOIL_COLORS = {
+    "clay": (180, 120, 80),
+    "loam": (160, 100, 60),
+    "sand": (220, 200, 160),
+    "silt": (200, 180, 140),
+    "clay_loam": (170, 110, 70),
+    "sandy_loam": (210, 190, 150),
+    "silt_loam": (190, 170, 130)
+}
+
+SOIL_IMAGE_SIZE = (400, 300)
+
+# Speckles per pixel of a soil image (800 on the original 400 x 300 swatch)
+SPECKLE_DENSITY = 800 / (400 * 300)
+
+# Speckle diameters are drawn from [SPECKLE_MIN, SPECKLE_MAX)
+SPECKLE_MIN, SPECKLE_MAX = 2, 8
+
+def load_font(name="arial.ttf", size=40):
+    try:
+        return ImageFont.truetype(name, size)
+    except OSError:
+        return ImageFont.load_default()
+
+def speckle_masks(count, size=SOIL_IMAGE_SIZE, seed=0):
     """
-    Generate soil type images if they don't exist
+    Boolean (count, height, width) masks of randomly placed filled circles,
+    built for all images with one scatter instead of one draw call each.
+    The same seed always gives the same masks.
     """
-    try:
-        soil_colors = {
-            "clay": (180, 120, 80),
-            "loam": (160, 100, 60),
-            "sand": (220, 200, 160),
-            "silt": (200, 180, 140),
-            "clay_loam": (170, 110, 70),
-            "sandy_loam": (210, 190, 150),
-            "silt_loam": (190, 170, 130)
-        }
-        
-        os.makedirs("assets/soil_types", exist_ok=True)
+    width, height = size
+    rng = np.random.default_rng(seed)
+    n = max(1, round(SPECKLE_DENSITY * width * height))
+    x = rng.integers(0, width, (count, n))
+    y = rng.integers(0, height, (count, n))
+    diameter = rng.integers(SPECKLE_MIN, SPECKLE_MAX, (count, n))
+
+    # Disk stencil of each diameter within a SPECKLE_MAX x SPECKLE_MAX box from its corner
+    oy, ox = np.divmod(np.arange(SPECKLE_MAX * SPECKLE_MAX), SPECKLE_MAX)
+    center = np.arange(SPECKLE_MIN, SPECKLE_MAX)[:, None] / 2
+    disks = (oy - center) ** 2 + (ox - center) ** 2 <= (center + 0.5) ** 2
+
+    # Flat pixel index of every stencil cell of every speckle, clipped at the edges
+    corner = (np.arange(count)[:, None] * height + y) * width + x
+    pixels = corner[..., None] + (oy * width + ox)
+    inside = disks[diameter - SPECKLE_MIN]
+    inside &= (y[..., None] + oy < height) & (x[..., None] + ox < width)
+
+    masks = np.zeros((count, height, width), dtype=bool)
+    masks.reshape(-1)[pixels[inside]] = True
+    return masks
+
+def render_soil_images(soil_colors, size=SOIL_IMAGE_SIZE, seed=0):
+    """
+    Draw soil swatches for {soil_type: color}: the base color with darker
+    speckles and the class name. The textures of all classes are built in
+    one array pass; returns {soil_type: image}.
+    """
+    width, height = size
+    masks = speckle_masks(len(soil_colors), size, seed).view(np.uint8)
+
+    font = load_font(size=max(8, round(40 * height / 300)))
+    images = {}
+    for (soil_type, color), mask in zip(soil_colors.items(), masks):
+        # The mask indexes a two-color palette: base color and darker speckle
+        img = Image.fromarray(mask, 'P')
+        img.putpalette(list(color) + [max(0, c-30) for c in color])
+        img = img.convert('RGB')
         
-        for soil_type, color in soil_colors.items():
-            img_path = f"assets/soil_types/{soil_type}.png"
-            if not os.path.exists(img_path):
-                img = Image.new('RGB', (400, 300), color=color)
-                draw = ImageDraw.Draw(img)
-                
-                # Add texture
-                for _ in range(800):
-                    x = np.random.randint(0, 400)
-                    y = np.random.randint(0, 300)
-                    size = np.random.randint(2, 8)
-                    draw.ellipse([(x, y), (x+size, y+size)], 
-                               fill=tuple(max(0, c-30) for c in color))
-                
-                # Add text
-                try:
-                    font = ImageFont.truetype("arial.ttf", 40)
-                except:
-                    font = ImageFont.load_default()
-                
-                draw.text((120, 120), soil_type.upper().replace('_', ' '), fill=(255, 255, 255), font=font)
-                img.save(img_path)
-                
-        return True
-    except Exception as e:
-        print(f"Error generating soil images: {e}")
-        return False
+        # Add text
+        ImageDraw.Draw(img).text((width * 0.3, height * 0.4), soil_type.upper().replace('_', ' '),
+                                 fill=(255, 255, 255), font=font)
+        images[soil_type] = img
+    return images
+
+def generate_soil_images(size=SOIL_IMAGE_SIZE, seed=0):
+    """
+    Render every soil class, returning {soil_type: image}
+    """
+    return render_soil_images(SOIL_COLORS, size, seed)
 
 def generate_logo():
     """
-    Generate logo if it doesn't exist
+    Render the VARUN AI logo: a sun over a crop field with the name
     """
-    try:
-        if not os.path.exists("assets/logo.png"):
-            img = Image.new('RGB', (400, 200), color=(46, 139, 87))
-            draw = ImageDraw.Draw(img)
-            
-            # Draw VARUN text
-            try:
-                font = ImageFont.truetype("arial.ttf", 40)
-            except:
-                font = ImageFont.load_default()
-            
-            draw.text((120, 70), "VARUN", fill=(255, 255, 255), font=font)
-            draw.text((130, 120), "ai", fill=(255, 215, 0), font=font)
-            
-            # Draw plant icon
-            draw.ellipse([(30, 70), (90, 130)], fill=(255, 215, 0))  # Sun
-            img.save("assets/logo.png")
-            
-        return True
-    except Exception as e:
-        print(f"Error generating logo: {e}")
-        return False
+    img = Image.new('RGBA', (400, 200), color=(0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    
+    # Draw a stylized sun and field
+    # Sun with gradient effect
+    for i in range(60, 0, -5):
+        draw.ellipse([(50-i, 30-i), (120+i, 100+i)], 
+                   fill=(255, 165, 0, 100 - i))
+    
+    # Field with crops
+    draw.rectangle([(0, 130), (400, 200)], fill=(143, 188, 143, 200))
+    
+    # Crops in the field
+    for i in range(0, 400, 20):
+        draw.rectangle([(i, 110), (i+10, 130)], fill=(107, 142, 35, 255))
+    
+    # VARUN AI text with premium font style
+    draw.text((150, 70), "VARUN", fill=(45, 80, 22, 255), font=load_font("arialbd.ttf", 36))
+    draw.text((150, 110), "AI CROP ADVISOR", fill=(45, 80, 22, 255), font=load_font("arial.ttf", 20))
+    return img
+
+if __name__ == "__main__":
+    import assets
+    manifest = assets.build()
+    print(f"Built {len(manifest['assets'])} assets ({manifest['build']})")
@@ -1 +1,262 @@
+# Languages offered in the sidebar, mapped to their translation codes
+LANGUAGES = {
+    'English': 'EN',
+    'Hindi': 'HI',
+    'Odia': 'OD',
+    'Telugu': 'TE',
+    'Bengali': 'BN'
+}
 
+# UI strings for every language, built once per process at import
+TRANSLATIONS = {
+    'EN': {
+        'title': 'VARUN AI Crop Recommendation',
+        'tagline': 'Vikasit Adhunik Roopantaran ke liye Uttam Nirdesh',
+        'farmer_details': 'Farmer Details',
+        'full_name': 'Full Name',
+        'region': 'Region',
+        'farm_size': 'Farm Size (acres)',
+        'soil_properties': 'Soil Properties',
+        'soil_type': 'Soil Type',
+        'soil_ph': 'Soil pH',
+        'soil_moisture': 'Soil Moisture (%)',
+        'nitrogen': 'Nitrogen (kg/ha)',
+        'phosphorus': 'Phosphorus (kg/ha)',
+        'potassium': 'Potassium (kg/ha)',
+        'environmental_factors': 'Environmental Factors',
+        'temperature': 'Temperature (°C)',
+        'rainfall': 'Annual Rainfall (mm)',
+        'humidity': 'Humidity (%)',
+        'analyze_button': 'Analyze & Recommend',
+        'farm_overview': 'Farm Overview',
+        'crop_recommendation': 'Crop Recommendation',
+        'soil_analysis': 'Soil Analysis',
+        'weather_forecast': 'Weather Forecast',
+        'top_recommendation': 'Top Recommendation',
+        'expected_yield': 'Expected Yield',
+        'success_probability': 'Success Probability',
+        'why_this_crop': 'Why this crop?',
+        'best_planting_time': 'Best Planting Time',
+        'water_requirements': 'Water Requirements',
+        'fertilizer_recommendations': 'Fertilizer Recommendations',
+        'harvest_timeline': 'Harvest Timeline',
+        'market_insights': 'Market Insights',
+        'current_market_price': 'Current market price',
+        'demand_trend': 'Demand trend',
+        'alternative_options': 'Alternative Options',
+        'fertilizer_guide': 'Fertilizer Guide',
+        'crop_diseases': 'Crop Diseases & Prevention',
+        'common_diseases': 'Common Diseases',
+        'prevention_methods': 'Prevention Methods',
+        'created_by': 'Created with ❤ by',
+        'team_name': 'Team Agro-Nova',
+        'for_sih': 'for SIH 2025',
+        'generate_data': 'Generate Sample Data',
+        'regions': ['Select', 'Punjab', 'Haryana', 'Uttar Pradesh', 'Maharashtra', 
+                   'Karnataka', 'Tamil Nadu', 'Andhra Pradesh', 'Gujarat',
+                   'Odisha', 'Jharkhand', 'West Bengal', 'Bihar'],
+        'soil_types': ['Select', 'Loam', 'Clay', 'Sandy', 'Silt'],
+        'generate_weather': 'Generate Weather Data',
+        'generate_soil': 'Generate Soil Data'
+    },
+    'HI': {
+        'title': 'VARUN AI फसल सिफारिश',
+        'tagline': 'इष्टतम मार्गदर्शन के लिए उन्नत आधुनिक परिवर्तन',
+        'farmer_details': 'किसान का विवरण',
+        'full_name': 'पूरा नाम',
+        'region': 'क्षेत्र',
+        'farm_size': 'खेत का आकार (एकड़)',
+        'soil_properties': 'मिट्टी के गुण',
+        'soil_type': 'मिट्टी का प्रकार',
+        'soil_ph': 'मिट्टी का पीएच',
+        'soil_moisture': 'मिट्टी की नमी (%)',
+        'nitrogen': 'नाइट्रोजन (किग्रा/हेक्टेयर)',
+        'phosphorus': 'फॉस्फोरस (किग्रा/हेक्टेयर)',
+        'potassium': 'पोटेशियम (किग्रा/हेक्टेयर)',
+        'environmental_factors': 'पर्यावरणीय कारक',
+        'temperature': 'तापमान (°C)',
+        'rainfall': 'वार्षिक वर्षा (मिमी)',
+        'humidity': 'आर्द्रता (%)',
+        'analyze_button': 'विश्लेषण और सिफारिश करें',
+        'farm_overview': 'खेत का अवलोकन',
+        'crop_recommendation': 'फसल सि फारिश',
+        'soil_analysis': 'मिट्टी विश्लेषण',
+        'weather_forecast': 'मौसम पूर्वानुमान',
+        'top_recommendation': 'शीर्ष सिफारिश',
+        'expected_yield': 'अनुमानित उपज',
+        'success_probability': 'सफलता की संभावना',
+        'why_this_crop': 'यह फसल क्यों?',
+        'best_planting_time': 'बुवाई का सबसे अच्छा समय',
+        'water_requirements': 'पानी की आवश्यकता',
+        'fertilizer_recommendations': 'उर्वरक सिफारिशें',
+        'harvest_timeline': 'कटाई का समय',
+        'market_insights': 'बाजार की जानकारी',
+        'current_market_price': 'वर्तमान बाजार मूल्य',
+        'demand_trend': 'मांग का रुझान',
+        'alternative_options': 'वैकल्पिक विकल्प',
+        'fertilizer_guide': 'उर्वरक गाइड',
+        'crop_diseases': 'फसल रोग और रोकथाम',
+        'common_diseases': 'सामान्य रोग',
+        'prevention_methods': 'रोकथाम के तरीके',
+        'created_by': '❤ से बनाया गया',
+        'team_name': 'team Agro-Nova',
+        'for_sih': 'एसआईएच 2025 के लिए',
+        'generate_data': 'नमूना डेटा जनरेट करें',
+        'regions': ['चुनें', 'पंजाब', 'हरियाणा', 'उत्तर प्रदेश', 'महाराष्ट्र',
+                   'कर्नाटक', 'तमिलनाडु', 'आंध्र प्रदेश', 'गुजरात',
+                   'ओडिशा', 'झारखंड', 'पश्चिम बंगाल', 'बिहार'],
+        'soil_types': ['चुनें', 'दोमट', 'चिकनी', 'बलुई', 'गाद'],
+        'generate_weather': 'मौसम डेटा जनरेट करें',
+        'generate_soil': 'मिट्टी डेटा जनरेट करें'
+    },
+    'OD': {
+        'title': 'VARUN AI ଫସଲ ପରାମର୍ଶ',
+        'tagline': 'ବିକଶିତ ଆଧୁନିକ ରୂପାନ୍ତରଣ ପାଇଁ ଉତ୍ତମ ନିର୍ଦ୍ଦେଶ',
+        'farmer_details': 'କୃଷକର ବିବରଣୀ',
+        'full_name': 'ପୂରା ନାମ',
+        'region': 'ଅଞ୍ଚଳ',
+        'farm_size': 'ଚାଷଜମିର ଆକାର (ଏକର)',
+        'soil_properties': 'ମୃତ୍ତିକା ଗୁଣ',
+        'soil_type': 'ମୃତ୍ତିକା ପ୍ରକାର',
+        'soil_ph': 'ମୂର୍ତ୍ତିକାର (ଅମ୍ଳ,କ୍ଷାରକ,ଲବଣ)',
+        'soil_moisture': 'ମୃତ୍ତିକା ଆର୍ଦ୍ରତା (%)',
+        'nitrogen': 'ନାଇଟ୍ରୋଜେନ (କି.ଗ୍ରା./ହେକ୍ଟର)',
+        'phosphorus': 'ଫସଫରସ (କି.ଗ୍ରା./ହେକ୍ଟର)',
+        'potassium': 'ପୋଟାସିଅମ (କି.ଗ୍ରା./ହେକ୍ଟର)',
+        'environmental_factors': 'ପରିବେଶଗତ କାରକ',
+        'temperature': 'ତାପମାତ୍ରା (°C)',
+        'rainfall': 'ବାର୍ଷିକ ବର୍ଷା (ମି.ମି.)',
+        'humidity': 'ଆର୍ଦ୍ରତା (%)',
+        'analyze_button': 'ବିଶ୍ଳେଷଣ ଏବଂ ପରାମର୍ଶ ଦିଅନ୍ତୁ',
+        'farm_overview': 'ଚାଷଜମି ସମୀକ୍ଷା',
+        'crop_recommendation': 'ଫସଲ ପରାମର୍ଶ',
+        'soil_analysis': 'ମୃତ୍ତିକା ବିଶ୍ଳେଷଣ',
+        'weather_forecast': 'ପାଣିପାଗ ପୂର୍ବାନୁମାନ',
+        'top_recommendation': 'ଶୀର୍ଷ ପରାମର୍ଶ',
+        'expected_yield': 'ଆଶାକୃତ ଫଳନ',
+        'success_probability': 'ସଫଳତା ସମ୍ଭାବନା',
+        'why_this_crop': 'ଏହି ଫସଲ କାହିଁକି?',
+        'best_planting_time': 'ସର୍ବୋତ୍ତମ ରୋପଣ ସମୟ',
+        'water_requirements': 'ଜଳ ଆବଶ୍ୟକତା',
+        'fertilizer_recommendations': 'ସାର ପରାମର୍ଶ',
+        'harvest_timeline': 'ଫସଲ କଟାଇ ସଞୟ',
+        'market_insights': 'ବଜାର ଅନୁଧ୍ୟାନ',
+        'current_market_price': 'ବର୍ତ୍ତମାନ ବଜାର ମୂଲ୍ୟ',
+        'demand_trend': 'ଚାହିଦା ପ୍ରବୃତ୍ତି',
+        'alternative_options': 'ବିକଳ୍ପ',
+        'fertilizer_guide': 'ସାର ମାର୍ଗଦର୍ଶକ',
+        'crop_diseases': 'ଫସଲ ରୋଗ ଏବଂ ପ୍ରତିଷେଧ',
+        'common_diseases': 'ସାଧାରଣ ରୋଗ',
+        'prevention_methods': 'ପ୍ରତିଷେଧ ପଦ୍ଧତି',
+        'created_by': '❤ ଦ୍ୱାରା ସୃଷ୍ଟି',
+        'team_name': 'team Agro-Nova',
+        'for_sih': 'SIH 2025 ପାଇଁ',
+        'generate_data': 'ନମୁନା ତଥ୍ୟ ଜେନେରେଟ୍ କରନ୍ତୁ',
+        'regions': ['ବାଛନ୍ତୁ', 'ପଞ୍ଜାବ', 'ହରିଆଣା', 'ଉତ୍ତର ପ୍ରଦେଶ', 'ମହାରାଷ୍ଟ୍ର',
+                   'କର୍ଣ୍ଣାଟକ', 'ତାମିଲନାଡୁ', 'ଆନ୍ଧ୍ର ପ୍ରଦେଶ', 'ଗୁଜରାଟ',
+                   'ଓଡିଶା', 'ଝାଡ଼ଖଣ୍ଡ', 'ପଶ୍ଚିମ ବଙ୍ଗ', 'ବିହାର'],
+        'soil_types': ['ବାଛନ୍ତୁ', 'ଦୋଆଁଶ', 'ମଟିଆ', 'ବାଲିଆ', 'ପାଣିକଙ୍କ'],
+        'generate_weather': 'ପାଣିପାଗ ତଥ୍ୟ ଜେନେରେଟ୍ କରନ୍ତୁ',
+        'generate_soil': 'ମୃତ୍ତିକା ତଥ୍ୟ ଜେନେରେଟ୍ କରନ୍ତୁ'
+    },
+    'TE': {
+        'title': 'వరుణ్ AI పంట సిఫార్సు',
+        'tagline': 'ఉత్తమ మార్గదర్శకత్వం కోసం అధునాతన ఆధునిక పరివర్తన',
+        'farmer_details': 'రైతు వివరాలు',
+        'full_name': 'పూర్తి పేరు',
+        'region': 'ప్రాంతం',
+        'farm_size': 'వ్యవసాయ భూమి పరిమాణం (ఎకరాలు)',
+        'soil_properties': 'నేల లక్షణాలు',
+        'soil_type': 'నేల రకం',
+        'soil_ph': 'నేల pH',
+        'soil_moisture': 'నేల ఆర్ద్రత (%)',
+        'nitrogen': 'నత్రజని (కి.గ్రా./హెక్టేర్)',
+        'phosphorus': 'భాస్వరం (కి.గ్రా./హెక్టేర్)',
+        'potassium': 'పొటాషియం (కి.ग్రా./హెక్టేर్)',
+        'environmental_factors': 'పర్యావరణ కారకాలు',
+        'temperature': 'ఉష్ణోగ్రత (°C)',
+        'rainfall': 'వార్షిక వర్షపాతం (మి.మీ.)',
+        'humidity': 'ఆర్ద్రత (%)',
+        'analyze_button': 'విశ్లేషించి సిఫార్సు చేయండి',
+        'farm_overview': 'వ్యవసాయ భూమి అవలోకనం',
+        'crop_recommendation': 'పంట సిఫార్సు',
+        'soil_analysis': 'నేల విశ్లేషణ',
+        'weather_forecast': 'వాతావరణ పూర్వానుమానం',
+        'top_recommendation': 'టాప్ సిఫార్సు',
+        'expected_yield': 'అంచనా దిగుబడి',
+        'success_probability': 'విజయ సంభావ్యత',
+        'why_this_crop': 'ఈ పంట ఎందుకు?',
+        'best_planting_time': 'ఉత్తమ నాటే సమయం',
+        'water_requirements': 'నీటి అవసరాలు',
+        'fertilizer_recommendations': 'ఎరువు సి फార్సులు',
+        'harvest_timeline': 'పంట కోత సమయం',
+        'market_insights': 'మార్కెట్ ఇన్సైట్స్',
+        'current_market_price': 'ప్రస్తుత మార్కెట్ ధర',
+        'demand_trend': 'డిమాండ్ ట్రెండ్',
+        'alternative_options': 'ప్రత్యామ్నాయ ఎంపికలు',
+        'fertilizer_guide': 'ఎరువు గైడ్',
+        'crop_diseases': 'పంట రోగాలు & నివారణ',
+        'common_diseases': 'సాధారణ రోగాలు',
+        'prevention_methods': 'నివారణ పద్ధతులు',
+        'created_by': '❤ తో సృష్టించబడింది',
+        'team_name': 'టీమ్ అగ్రోనోవా',
+        'for_sih': 'SIH 2025 కోసం',
+        'generate_data': 'నమూనా డేటా జనరేట్ చేయండి',
+        'regions': ['ఎంచుకోండి', 'పంజాబ్', 'హర్యాణా', 'ఉత్తర ప్రదేశ్', 'మహారాష్ట్ర',
+                   'కర్ణాటక', 'తమిళనాడు', 'ఆంధ్ర ప్రదేశ్', 'గుజरాత్',
+                   'ఒడిశా', 'ఝార్ఖండ్', 'పశ్చిమ బెంగాల్', 'బీహార్'],
+        'soil_types': ['ఎంచుకోండి', 'దోషం', 'మట్టి', 'ఇసుక', 'సిల్ట్'],
+        'generate_weather': 'వాతావరణ డేటా జనరేట్ చేయండి',
+        'generate_soil': 'నేల డేటా జనరేట్ చేయండి'
+    },
+    'BN': {
+        'title': 'ভরুণ AI ফসল সুপারিশ',
+        'tagline': 'সর্বোত্তম নির্দেশনার জন্য উন্নত আধুনিক রূপান্তর',
+        'farmer_details': 'কৃষকের বিবরণ',
+        'full_name': 'পুরো নাম',
+        'region': 'অঞ্চল',
+        'farm_size': 'খামারের আকার (একর)',
+        'soil_properties': 'মাটির বৈশিষ্ট্য',
+        'soil_type': 'মাটির ধরন',
+        'soil_ph': 'মাটির pH',
+        'soil_moisture': 'মাটির আর্দ্রতা (%)',
+        'nitrogen': 'নাইট্রোজেন (কেজি/হেক্টর)',
+        'phosphorus': 'ফসফরাস (कেজি/হেক্টর)',
+        'potassium': 'পটাসিয়াম (कেজি/হেক্টর)',
+        'environmental_factors': 'পরিবেশগত কারণ',
+        'temperature': 'তাপমাত্রা (°C)',
+        'rainfall': 'বার্ষিক বৃষ্টিপাত (মিমি)',
+        'humidity': 'আর্দ্রতা (%)',
+        'analyze_button': 'বিশ্লেষণ এবং সুপারিশ করুন',
+        'farm_overview': 'খামার ওভারভিউ',
+        'crop_recommendation': 'ফসল সুপارিশ',
+        'soil_analysis': 'মাটির বিশ্লেষণ',
+        'weather_forecast': 'আবহাওয়ার পূর্বাভাস',
+        'top_recommendation': 'শীর্ষ সুপারিশ',
+        'expected_yield': 'আনুমানিক ফলন',
+        'success_probability': 'সাফল্যের সম্ভাবনা',
+        'why_this_crop': 'এই ফসল কেন?',
+        'best_planting_time': 'সেরা রোপণের সময়',
+        'water_requirements': 'পানির প্রয়োজনীয়তা',
+        'fertilizer_recommendations': 'সার সুপারিশ',
+        'harvest_timeline': 'ফসল কাটার সময়',
+        'market_insights': 'বাজার অন্তর্দৃষ্টি',
+        'current_market_price': 'বর্তমান বাজার মূল্য',
+        'demand_trend': 'চাহিদার প্রবণতা',
+        'alternative_options': 'বিকল্প বিকল্প',
+        'fertilizer_guide': 'সার গাইড',
+        'crop_diseases': 'ফসল রোগ ও প্রতিরোধ',
+        'common_diseases': 'সাধারণ রোগ',
+        'prevention_methods': 'প্রতিরোধ পদ্ধতি',
+        'created_by': '❤ দিয়ে তৈরি',
+        'team_name': 'টিম এগ্রোনোভা',
+        'for_sih': 'SIH 2025 এর জন্য',
+        'generate_data': 'নমুনা ডেটা তৈরি করুন',
+        'regions': ['নির্বাচন করুন', 'পাঞ্জাব', 'হরিয়ানা', 'উত্তর প্রদেশ', 'মহারাষ্ট্র',
+                   'কর্ণাটক', 'তামিলনাড়ু', 'আন্ধ্র প্রদেশ', 'গুজরাট',
+                   'ওড়িশা', 'ঝাড়খণ্ড', 'পশ্চিম বঙ্গ', 'বিহার'],
+        'soil_types': ['নির্বাচন করুন', 'দোআঁশ', 'কাদা', 'বালি', 'পলি'],
+        'generate_weather': 'আবহাওয়া ডেটা তৈরি করুন',
+        'generate_soil': 'মাটি ডেটা তৈরি করুন'
+    }
+}
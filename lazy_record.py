@@ -0,0 +1,33 @@
+class LazyRecord(dict):
+    """
+    A result dict whose expensive entries (explanation text) are computed on
+    first access and then kept. Numeric entries are stored eagerly.
+
+    Pending entries are not visible to iteration, len() or json.dumps until
+    they are accessed; call resolve() before serializing the whole record.
+    """
+
+    def __init__(self, eager, lazy):
+        super().__init__(eager)
+        self._pending = dict(lazy)
+
+    def __missing__(self, key):
+        compute = self._pending.get(key)
+        if compute is None:
+            raise KeyError(key)
+        value = compute()
+        self[key] = value
+        self._pending.pop(key, None)
+        return value
+
+    def __contains__(self, key):
+        return super().__contains__(key) or key in self._pending
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def resolve(self):
+        """Compute every pending entry and return the record"""
+        for key in list(self._pending):
+            self[key]
+        return self
@@ -0,0 +1,72 @@
+import csv
+import hashlib
+
+# Expected yield (tons/acre) and market price (₹/kg) providers. Every
+# provider is a pure function of the crop and the farm inputs, so results
+# that include yield and price can be cached and batched.
+
+class HashedProvider:
+    """Derive yield and price from a seeded hash of the crop and farm inputs"""
+
+    def __init__(self, seed=0):
+        self.seed = seed
+
+    def _digest(self, crop_name, inputs):
+        key = [self.seed, crop_name]
+        for value in inputs:
+            # 50 and 50.0 must hash the same
+            if not isinstance(value, str):
+                try:
+                    value = round(float(value), 3)
+                except TypeError:
+                    value = str(value)
+            key.append(value)
+        return hashlib.blake2b(repr(key).encode(), digest_size=16).digest()
+
+    def estimate(self, crop_name, inputs, yield_range, price_range):
+        digest = self._digest(crop_name, inputs)
+        fraction = int.from_bytes(digest[:8], 'big') / 2**64
+        crop_yield = yield_range[0] + fraction * (yield_range[1] - yield_range[0])
+        price = price_range[0] + int.from_bytes(digest[8:], 'big') % (price_range[1] - price_range[0])
+        return crop_yield, price
+
+class TableProvider:
+    """
+    Look up yield and price per crop in a CSV file with 'crop', 'yield' and
+    'market_price' columns, loaded once. Crops missing from the table are
+    passed to the fallback provider.
+    """
+
+    def __init__(self, path, fallback=None):
+        self.fallback = fallback or HashedProvider()
+        self.table = {}
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                self.table[row['crop']] = (float(row['yield']), int(row['market_price']))
+
+    def estimate(self, crop_name, inputs, yield_range, price_range):
+        if crop_name in self.table:
+            return self.table[crop_name]
+        return self.fallback.estimate(crop_name, inputs, yield_range, price_range)
+
+_provider = HashedProvider()
+
+def set_provider(provider):
+    """
+    Replace the process-wide yield and price provider. Results already cached
+    with the previous provider are kept; call recommendation.cache_clear() to
+    drop them.
+    """
+    global _provider
+    _provider = provider
+
+def get_provider():
+    """Return the process-wide yield and price provider"""
+    return _provider
+
+def estimate_yield_and_price(crop_name, inputs, yield_range=(2.0, 5.0), price_range=(25, 55)):
+    """
+    Return (yield in tons/acre, market price in ₹/kg) for a crop grown with
+    the given farm inputs. The price range excludes its upper bound.
+    """
+    return _provider.estimate(crop_name, inputs, yield_range, price_range)
@@ -1,123 +1,78 @@
 import pandas as pd
 import numpy as np
 
+import crop_catalog
+from market import estimate_yield_and_price
+
+# Crops this model chooses between
+MODEL_CROPS = ['Wheat', 'Rice', 'Maize', 'Cotton', 'Soybean']
+
+# Input columns scored by this model, with the matching catalog range factor
+MODEL_INPUTS = ['ph', 'temperature', 'rainfall', 'nitrogen', 'phosphorus', 'potassium']
+_MODEL_FACTORS = ['ph', 'temp', 'rainfall', 'n', 'p', 'k']
+
+# Points for a value inside the optimal range, and the penalty per unit of
+# distance from the middle of the range for a value outside it
+IN_RANGE_POINTS = np.array([20, 15, 15, 8, 8, 9])
+OUT_OF_RANGE_PENALTY = np.array([10, 5, 3, 2, 2, 2])
+SOIL_MATCH_POINTS = 25
+
+# Catalog slices for the model crops, built once at import
+_rows = [crop_catalog.CROP_INDEX[name] for name in MODEL_CROPS]
+_CROP_RECORDS = [crop_catalog.RECORDS[row] for row in _rows]
+_cols = [crop_catalog.RANGE_FACTORS.index(factor) for factor in _MODEL_FACTORS]
+_RANGE_MIN = crop_catalog.RANGE_MIN[np.ix_(_rows, _cols)]
+_RANGE_MAX = crop_catalog.RANGE_MAX[np.ix_(_rows, _cols)]
+_RANGE_MID = crop_catalog.RANGE_MID[np.ix_(_rows, _cols)]
+# Soil code x model crop: the soil is the crop's preferred one
+_SOIL_MATCH = crop_catalog.SOIL_PREFERRED[:, _rows]
+
+def score_crops(soil_types, values):
+    """
+    Score N farms against every model crop.
+
+    `soil_types` has N soil labels and `values` is (N, 6) in MODEL_INPUTS order.
+    Returns an (N, len(MODEL_CROPS)) score array.
+    """
+    x = np.asarray(values, dtype=float)[:, None, :]
+    inside = (_RANGE_MIN <= x) & (x <= _RANGE_MAX)
+    points = np.where(inside, IN_RANGE_POINTS, -OUT_OF_RANGE_PENALTY * np.abs(x - _RANGE_MID))
+    soil_match = _SOIL_MATCH[crop_catalog.encode(soil_types, crop_catalog.SOIL_INDEX)]
+    return points.sum(axis=-1) + np.where(soil_match, SOIL_MATCH_POINTS, 0)
+
+def predict_many(farms):
+    """
+    Predict the best crop for many farms at once.
+
+    `farms` is a DataFrame or a mapping of column name to array with
+    'soil_type' and the MODEL_INPUTS columns. Returns a DataFrame with the
+    best crop, its score and the success probability for each farm.
+    """
+    values = np.column_stack([np.asarray(farms[column], dtype=float) for column in MODEL_INPUTS])
+    scores = score_crops(farms['soil_type'], values)
+    best = scores.argmax(axis=1)
+    best_scores = scores[np.arange(len(best)), best]
+    return pd.DataFrame({
+        'crop': np.asarray(MODEL_CROPS)[best],
+        'score': best_scores,
+        'probability': np.clip(best_scores.astype(int), 65, 95)
+    })
+
 def predict_best_crop(soil_type, ph, nitrogen, phosphorus, potassium, temperature, rainfall, humidity):
     """Predict the best crop based on environmental conditions"""
-    # Load crop data
-    crops_df = pd.DataFrame([
-        {
-            'name': 'Wheat',
-            'soil_type': 'Loam',
-            'ph_min': 6.0, 'ph_max': 7.5,
-            'temp_min': 10, 'temp_max': 25,
-            'rainfall_min': 500, 'rainfall_max': 1000,
-            'n_min': 50, 'n_max': 80,
-            'p_min': 30, 'p_max': 60,
-            'k_min': 40, 'k_max': 70
-        },
-        {
-            'name': 'Rice',
-            'soil_type': 'Clay',
-            'ph_min': 5.0, 'ph_max': 6.5,
-            'temp_min': 20, 'temp_max': 35,
-            'rainfall_min': 1000, 'rainfall_max': 2000,
-            'n_min': 60, 'n_max': 90,
-            'p_min': 40, 'p_max': 70,
-            'k_min': 50, 'k_max': 80
-        },
-        {
-            'name': 'Maize',
-            'soil_type': 'Loam',
-            'ph_min': 5.5, 'ph_max': 7.0,
-            'temp_min': 15, 'temp_max': 30,
-            'rainfall_min': 600, 'rainfall_max': 1200,
-            'n_min': 70, 'n_max': 100,
-            'p_min': 50, 'p_max': 80,
-            'k_min': 60, 'k_max': 90
-        },
-        {
-            'name': 'Cotton',
-            'soil_type': 'Sandy',
-            'ph_min': 5.5, 'ph_max': 7.5,
-            'temp_min': 20, 'temp_max': 35,
-            'rainfall_min': 500, 'rainfall_max': 800,
-            'n_min': 40, 'n_max': 70,
-            'p_min': 30, 'p_max': 60,
-            'k_min': 50, 'k_max': 80
-        },
-        {
-            'name': 'Soybean',
-            'soil_type': 'Silt',
-            'ph_min': 6.0, 'ph_max': 7.0,
-            'temp_min': 15, 'temp_max': 30,
-            'rainfall_min': 600, 'rainfall_max': 1000,
-            'n_min': 30, 'n_max': 60,
-            'p_min': 40, 'p_max': 70,
-            'k_min': 50, 'k_max': 80
-        }
-    ])
-    
-    # Calculate suitability score for each crop
-    scores = []
-    for _, crop in crops_df.iterrows():
-        score = 0
-        
-        # Soil type match
-        if crop['soil_type'] == soil_type:
-            score += 25
-        
-        # pH level suitability
-        if crop['ph_min'] <= ph <= crop['ph_max']:
-            score += 20
-        else:
-            score -= 10 * abs(ph - (crop['ph_min'] + crop['ph_max'])/2)
-        
-        # Temperature suitability
-        if crop['temp_min'] <= temperature <= crop['temp_max']:
-            score += 15
-        else:
-            score -= 5 * abs(temperature - (crop['temp_min'] + crop['temp_max'])/2)
-        
-        # Rainfall suitability
-        if crop['rainfall_min'] <= rainfall <= crop['rainfall_max']:
-            score += 15
-        else:
-            score -= 3 * abs(rainfall - (crop['rainfall_min'] + crop['rainfall_max'])/2)
-        
-        # Nutrient suitability
-        n_score = 0
-        if crop['n_min'] <= nitrogen <= crop['n_max']:
-            n_score += 8
-        else:
-            n_score -= 2 * abs(nitrogen - (crop['n_min'] + crop['n_max'])/2)
-        
-        p_score = 0
-        if crop['p_min'] <= phosphorus <= crop['p_max']:
-            p_score += 8
-        else:
-            p_score -= 2 * abs(phosphorus - (crop['p_min'] + crop['p_max'])/2)
-        
-        k_score = 0
-        if crop['k_min'] <= potassium <= crop['k_max']:
-            k_score += 9
-        else:
-            k_score -= 2 * abs(potassium - (crop['k_min'] + crop['k_max'])/2)
-        
-        score += n_score + p_score + k_score
-        
-        scores.append(score)
-    
-    # Add scores to dataframe
-    crops_df['score'] = scores
-    
-    # Get the best crop
-    best_crop = crops_df.loc[crops_df['score'].idxmax()]
+    # Score every crop in one pass and pick the best one
+    scores = score_crops([soil_type], [[ph, temperature, rainfall, nitrogen, phosphorus, potassium]])[0]
+    best = int(np.argmax(scores))
+    best_crop = dict(_CROP_RECORDS[best], score=scores[best])
+    crop_yield, market_price = estimate_yield_and_price(
+        best_crop['name'], (soil_type, ph, nitrogen, phosphorus, potassium, temperature, rainfall, humidity),
+        yield_range=(2.5, 4.5), price_range=(20, 45))
     
     # Generate recommendation details
     recommendation = {
         'crop': best_crop['name'],
         'probability': min(95, max(65, int(best_crop['score']))),
-        'yield': f"{np.random.uniform(2.5, 4.5):.1f}",
+        'yield': f"{crop_yield:.1f}",
         'reason': generate_reason(best_crop, soil_type, ph, temperature, rainfall, nitrogen, phosphorus, potassium),
         'planting_time': "October-November" if best_crop['name'] == 'Wheat' else 
                          "June-July" if best_crop['name'] == 'Rice' else
@@ -135,7 +90,7 @@ def predict_best_crop(soil_type, ph, nitrogen, phosphorus, potassium, temperatur
                         "October-November" if best_crop['name'] == 'Rice' else
                         "August-September" if best_crop['name'] == 'Maize' else
                         "October-December" if best_crop['name'] == 'Cotton' else "September-October",
-        'market_price': f"₹{np.random.randint(20, 45)}",
+        'market_price': f"₹{market_price}",
         'demand_trend': "Stable" if best_crop['name'] == 'Wheat' else 
                         "High" if best_crop['name'] == 'Rice' else
                         "Increasing" if best_crop['name'] == 'Maize' else
@@ -0,0 +1,135 @@
+import contextlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+
+# Opt-in per-stage timing for a Streamlit rerun. Disabled profilers hand out
+# a shared no-op context, so the instrumentation costs nothing by default.
+#
+# tracemalloc's peak counter is process-wide, so only one rerun at a time
+# measures allocations; reruns profiled meanwhile record times and blocks
+# only. Tracing is stopped when the rerun that started it finishes.
+
+logger = logging.getLogger("varun.profile")
+
+# Set to 1 to profile every rerun, or to "query" to profile only reruns
+# requested with ?profile=1
+ENV_FLAG = "VARUN_PROFILE"
+
+_DISABLED = contextlib.nullcontext()
+
+def enabled_by_env():
+    return os.environ.get(ENV_FLAG, "") not in ("", "0", "query")
+
+def enabled_for(query_value):
+    """Whether to profile a rerun whose ?profile= parameter is query_value (None if absent)"""
+    return enabled_by_env() or (os.environ.get(ENV_FLAG) == "query" and query_value == "1")
+
+# Weak reference to the profiler whose rerun owns tracemalloc, if any
+_tracer = None
+_tracer_lock = threading.Lock()
+
+def _claim_tracer(profiler):
+    global _tracer
+    with _tracer_lock:
+        if _tracer is not None and _tracer() is not None:
+            return None
+        _tracer = weakref.ref(profiler)
+        return _tracer
+
+def _release_tracer(ref, stop):
+    global _tracer
+    with _tracer_lock:
+        if _tracer is ref:
+            _tracer = None
+        if stop and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+class RerunProfiler:
+    """
+    Records wall time, peak traced allocation and net allocated blocks for
+    named stages of one rerun. Stages may nest; each records its own totals
+    and its nesting depth. Call finish() when the rerun ends.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stages = []
+        # [traced bytes at stage start, highest peak seen] for each open stage
+        self._open = []
+        self._started = time.perf_counter()
+        self.tracing = False
+        self._release = None
+        ref = _claim_tracer(self) if enabled else None
+        if ref is not None:
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            self.tracing = True
+            # Also releases tracing if the rerun is cut short and never calls finish()
+            self._release = weakref.finalize(self, _release_tracer, ref, started)
+
+    def stage(self, name):
+        """Context manager timing one stage; a no-op when profiling is off"""
+        if not self.enabled:
+            return _DISABLED
+        return self._record(name)
+
+    @contextlib.contextmanager
+    def _record(self, name):
+        entry = {'stage': name, 'depth': len(self._open)}
+        self.stages.append(entry)
+        if not self.tracing:
+            yield from self._time(entry)
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        # reset_peak below would lose the enclosing stage's peak so far
+        if self._open:
+            self._open[-1][1] = max(self._open[-1][1], peak)
+        tracemalloc.reset_peak()
+        frame = [current, current]
+        self._open.append(frame)
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry['wall_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            entry['blocks'] = sys.getallocatedblocks() - blocks
+            peak = max(tracemalloc.get_traced_memory()[1], frame[1])
+            entry['alloc_kb'] = round((peak - frame[0]) / 1024, 1)
+            self._open.pop()
+            if self._open:
+                self._open[-1][1] = max(self._open[-1][1], peak)
+
+    def _time(self, entry):
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry['wall_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            entry['blocks'] = sys.getallocatedblocks() - blocks
+            entry['alloc_kb'] = None
+
+    def finish(self):
+        """Stop tracing if this profiler started it; later stages are timed only"""
+        if self._release is not None:
+            self._release()
+        self.tracing = False
+
+    def total_ms(self):
+        return (time.perf_counter() - self._started) * 1000
+
+    def log(self, **context):
+        """Emit one JSON log line per stage and one for the whole rerun"""
+        if not self.enabled:
+            return
+        for entry in self.stages:
+            logger.info(json.dumps({'event': 'rerun_stage', **context, **entry}))
+        logger.info(json.dumps({'event': 'rerun_total', **context, 'wall_ms': round(self.total_ms(), 2)}))
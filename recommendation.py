@@ -0,0 +1,218 @@
+import functools
+
+import crop_catalog
+import score_table
+import scoring
+from crop_data import PLANTING_TIMES, WATER_REQUIREMENTS, HARVEST_TIMES
+from lazy_record import LazyRecord
+from market import estimate_yield_and_price
+
+# Enhanced crop recommendation model with detailed analysis, used by the
+# Streamlit app. All tables are built once per process at import.
+
+# Crop diseases and prevention
+CROP_DISEASES = {
+    'Wheat': {
+        'common': ['Rust', 'Smut', 'Powdery Mildew'],
+        'prevention': ['Use resistant varieties', 'Crop rotation', 'Fungicide application']
+    },
+    'Rice': {
+        'common': ['Blight', 'Tungro Virus', 'Sheath Blight'],
+        'prevention': ['Proper water management', 'Use certified seeds', 'Balanced fertilization']
+    },
+    'Maize': {
+        'common': ['Leaf Blight', 'Stalk Rot', 'Ear Rot'],
+        'prevention': ['Crop rotation', 'Timely harvesting', 'Use resistant hybrids']
+    },
+    'Cotton': {
+        'common': ['Boll Rot', 'Leaf Curl Virus', 'Wilt'],
+        'prevention': ['Intercropping', 'Use neem-based pesticides', 'Proper drainage']
+    },
+    'Soybean': {
+        'common': ['Rust', 'Pod Blight', 'Mosaic Virus'],
+        'prevention': ['Seed treatment', 'Weed control', 'Balanced fertilization']
+    },
+    'Pulses': {
+        'common': ['Wilt', 'Root Rot', 'Powdery Mildew'],
+        'prevention': ['Soil solarization', 'Use healthy seeds', 'Proper spacing']
+    },
+    'Sugarcane': {
+        'common': ['Red Rot', 'Smut', 'Ratoon Stunting'],
+        'prevention': ['Use disease-free setts', 'Hot water treatment', 'Crop rotation']
+    },
+    'Groundnut': {
+        'common': ['Leaf Spot', 'Rust', 'Collar Rot'],
+        'prevention': ['Crop rotation', 'Well-drained soil', 'Seed treatment']
+    }
+}
+
+# Recommended N, P and K application ranges in kg/ha; the soil values are clamped into them
+FERTILIZER_RANGES = {
+    'Wheat': ((40, 80), (30, 60), (40, 70)),
+    'Rice': ((60, 90), (40, 70), (50, 80)),
+    'Maize': ((70, 100), (50, 80), (60, 90)),
+    'Cotton': ((40, 70), (30, 60), (50, 80)),
+    'Soybean': ((30, 60), (40, 70), (50, 80)),
+    'Pulses': ((20, 50), (30, 60), (40, 70)),
+    'Sugarcane': ((100, 150), (50, 80), (80, 120)),
+    'Groundnut': ((20, 40), (30, 50), (40, 60))
+}
+
+def fertilizer_recommendation(crop_name, nitrogen, phosphorus, potassium):
+    """Fertilizer recommendation based on soil nutrients"""
+    if crop_name not in FERTILIZER_RANGES:
+        return 'N:P:K = 60:40:40 kg/ha'
+    doses = [max(low, min(high, value)) for (low, high), value
+             in zip(FERTILIZER_RANGES[crop_name], (nitrogen, phosphorus, potassium))]
+    return f"N:P:K = {doses[0]}:{doses[1]}:{doses[2]} kg/ha"
+
+_score_table = None
+
+def get_score_table():
+    """Return the dense score table, memory-mapped from score_table.DEFAULT_PATH on first use"""
+    global _score_table
+    if _score_table is None:
+        _score_table = score_table.load()
+    return _score_table
+
+def crop_scores(soil_type, ph, nitrogen, phosphorus, potassium, temperature, rainfall, region):
+    """
+    Return {factor: per-crop score array} for one farm. Slider values are
+    gathered from the dense score table; anything else is computed directly.
+    """
+    scores = score_table.lookup(get_score_table(), soil_type, ph, nitrogen, phosphorus,
+                                potassium, temperature, rainfall, region)
+    if scores is None:
+        scores = scoring.farm_scores(soil_type, ph, nitrogen, phosphorus, potassium,
+                                     temperature, rainfall, region)
+    return scores
+
+def crop_reasons(i, scores, soil_type, ph, temperature, rainfall, region):
+    """Explain the factor scores of catalog crop i for the farm"""
+    crop = crop_catalog.RECORDS[i]
+    reasons = []
+    
+    # Regional preference (higher weight)
+    if scores['regional_preference'][i] > 0:
+        reasons.append(f"Highly suitable for {region} region")
+    elif region != "Select":
+        reasons.append(f"Not typically grown in {region}")
+    
+    # Soil type match
+    if scores['soil_type'][i] > 0:
+        reasons.append(f"Ideal for {soil_type} soil")
+    elif soil_type != "Select":
+        reasons.append(f"Not optimal for {soil_type} soil (prefers {crop['soil_type']})")
+    
+    # pH suitability
+    if crop['ph_min'] <= ph <= crop['ph_max']:
+        reasons.append(f"Optimal pH range ({crop['ph_min']}-{crop['ph_max']})")
+    elif ph < crop['ph_min']:
+        reasons.append(f"pH slightly low (ideal: {crop['ph_min']}-{crop['ph_max']})")
+    else:
+        reasons.append(f"pH slightly high (ideal: {crop['ph_min']}-{crop['ph_max']})")
+    
+    # Temperature suitability
+    if crop['temp_min'] <= temperature <= crop['temp_max']:
+        reasons.append(f"Optimal temperature range ({crop['temp_min']}-{crop['temp_max']}°C)")
+    elif temperature < crop['temp_min']:
+        reasons.append(f"Temperature slightly low (ideal: {crop['temp_min']}-{crop['temp_max']}°C)")
+    else:
+        reasons.append(f"Temperature slightly high (ideal: {crop['temp_min']}-{crop['temp_max']}°C)")
+    
+    # Rainfall suitability
+    if crop['rainfall_min'] <= rainfall <= crop['rainfall_max']:
+        reasons.append(f"Optimal rainfall ({crop['rainfall_min']}-{crop['rainfall_max']}mm)")
+    elif rainfall < crop['rainfall_min']:
+        reasons.append(f"Rainfall slightly low (ideal: {crop['rainfall_min']}-{crop['rainfall_max']}mm)")
+    else:
+        reasons.append(f"Rainfall slightly high (ideal: {crop['rainfall_min']}-{crop['rainfall_max']}mm)")
+    
+    # Nutrient suitability
+    if scores['nitrogen'][i] < 5:
+        reasons.append(f"Nitrogen level not optimal for {crop['name']}")
+    if scores['phosphorus'][i] < 5:
+        reasons.append(f"Phosphorus level not optimal for {crop['name']}")
+    if scores['potassium'][i] < 5:
+        reasons.append(f"Potassium level not optimal for {crop['name']}")
+    
+    return reasons
+
+def compute_best_crops(soil_type, ph, nitrogen, phosphorus, potassium, temperature, rainfall, humidity, region, top_n=3):
+    """
+    Rank every catalog crop for the farm and return the top N with detailed
+    analysis. Crops are ranked on their numeric scores first; fertilizer and
+    disease details are only built for the winners, and their reasons only
+    when first read.
+    """
+    scores = crop_scores(soil_type, ph, nitrogen, phosphorus, potassium, temperature, rainfall, region)
+    nutrient_scores = scores['nitrogen'] + scores['phosphorus'] + scores['potassium']
+    total_scores = (scores['regional_preference'] + scores['soil_type'] + scores['ph_suitability']
+                    + scores['temperature_suitability'] + scores['rainfall_suitability'] + nutrient_scores)
+    
+    # Generate detailed recommendations for the top crops
+    recommendations = []
+    inputs = (soil_type, ph, nitrogen, phosphorus, potassium, temperature, rainfall, humidity, region)
+    
+    for rank, i in enumerate(crop_catalog.top_k(total_scores, top_n).tolist()):
+        crop_name = crop_catalog.CROP_NAMES[i]
+        score = float(total_scores[i])
+        crop_yield, market_price = estimate_yield_and_price(crop_name, inputs)
+        recommendations.append(LazyRecord({
+            'rank': rank+1,
+            'crop': crop_name,
+            'score': score,
+            'probability': min(95, max(65, int(score))),
+            'yield': f"{crop_yield:.1f}",
+            'details': {
+                'regional_preference': float(scores['regional_preference'][i]),
+                'soil_type': float(scores['soil_type'][i]),
+                'ph_suitability': float(scores['ph_suitability'][i]),
+                'temperature_suitability': float(scores['temperature_suitability'][i]),
+                'rainfall_suitability': float(scores['rainfall_suitability'][i]),
+                'nutrient_suitability': float(nutrient_scores[i])
+            },
+            'planting_time': PLANTING_TIMES.get(crop_name, 'Varies by region'),
+            'water_req': WATER_REQUIREMENTS.get(crop_name, 'Moderate (500-800 mm)'),
+            'fertilizer': fertilizer_recommendation(crop_name, nitrogen, phosphorus, potassium),
+            'harvest_time': HARVEST_TIMES.get(crop_name, 'September-October'),
+            'market_price': f"₹{market_price}",
+            'demand_trend': 'High' if crop_name in ['Rice', 'Wheat'] else 
+                            'Moderate' if crop_name in ['Maize', 'Cotton'] else
+                            'Stable',
+            'diseases': CROP_DISEASES.get(crop_name, {'common': [], 'prevention': []})
+        }, {
+            # Only generated when the reasons are displayed
+            'reasons': functools.partial(crop_reasons, i, scores, soil_type, ph, temperature, rainfall, region)
+        }))
+    
+    return recommendations
+
+# Maximum number of distinct farm inputs kept in the result cache
+RESULT_CACHE_SIZE = 4096
+
+_cached_best_crops = functools.lru_cache(maxsize=RESULT_CACHE_SIZE)(compute_best_crops)
+
+def quantize_inputs(soil_type, ph, nitrogen, phosphorus, potassium, temperature, rainfall, humidity, region):
+    """Snap farm inputs to the slider steps: pH to 0.1, everything else to whole units"""
+    return (soil_type, round(float(ph), 1), int(round(nitrogen)), int(round(phosphorus)),
+            int(round(potassium)), int(round(temperature)), int(round(rainfall)),
+            int(round(humidity)), region)
+
+def predict_best_crop(soil_type, ph, nitrogen, phosphorus, potassium, temperature, rainfall, humidity, region):
+    """
+    Return the top 3 recommendations for the farm.
+
+    Results are memoized in a bounded LRU cache keyed on the quantized inputs,
+    so the returned list is shared between callers and must not be modified.
+    """
+    return _cached_best_crops(*quantize_inputs(soil_type, ph, nitrogen, phosphorus, potassium,
+                                               temperature, rainfall, humidity, region))
+
+def cache_info():
+    """Hits, misses, max size and current size of the result cache"""
+    return _cached_best_crops.cache_info()
+
+def cache_clear():
+    """Empty the result cache and reset its counters"""
+    _cached_best_crops.cache_clear()
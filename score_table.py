@@ -0,0 +1,146 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+
+import numpy as np
+
+import crop_catalog
+import scoring
+
+# Precomputed per-factor, per-crop scores for the whole slider input space.
+# Every factor of the app's model depends on a single input, so a
+# recommendation is a gather of one row per factor from this table.
+
+logger = logging.getLogger("varun.score_table")
+
+DEFAULT_PATH = os.path.join("data", "score_table.npy")
+
+# Bump when the scoring functions change in a way their constants do not show
+TABLE_VERSION = 1
+
+# Slider grids as (factor, start, stop, step); the table rows follow this order
+GRIDS = [
+    ('ph_suitability', 4.0, 9.0, 0.1),
+    ('temperature_suitability', 0, 45, 1),
+    ('rainfall_suitability', 0, 2000, 1),
+    ('nitrogen', 0, 200, 1),
+    ('phosphorus', 0, 200, 1),
+    ('potassium', 0, 200, 1)
+]
+
+# Labelled rows; the last row of each block scores any other label. Region
+# rows follow scoring's region codes.
+REGION_LABELS = scoring.REGION_NAMES
+SOIL_LABELS = sorted({soil.lower() for soil in crop_catalog.CATALOG['soil_type']})
+
+# Row in the soil block for each soil code (scoring.soil_code)
+SOIL_ROWS = np.array([SOIL_LABELS.index(soil.lower()) if soil.lower() in SOIL_LABELS else len(SOIL_LABELS)
+                      for soil in crop_catalog.SOIL_NAMES] + [len(SOIL_LABELS)])
+
+def _grid_values(start, stop, step):
+    count = int(round((stop - start) / step)) + 1
+    return np.round(start + np.arange(count) * step, 1)
+
+def _layout():
+    """Return {factor: (first row, grid start, step, row count)} for every block"""
+    layout, row = {}, 0
+    for factor, start, stop, step in GRIDS:
+        count = len(_grid_values(start, stop, step))
+        layout[factor] = (row, start, step, count)
+        row += count
+    layout['regional_preference'] = (row, None, None, len(REGION_LABELS) + 1)
+    row += len(REGION_LABELS) + 1
+    layout['soil_type'] = (row, None, None, len(SOIL_LABELS) + 1)
+    return layout
+
+LAYOUT = _layout()
+ROW_COUNT = sum(count for _, _, _, count in LAYOUT.values())
+
+def build():
+    """Compute the dense (ROW_COUNT, n_crops) score table"""
+    blocks = [scoring.factor_score(factor, _grid_values(start, stop, step))
+              for factor, start, stop, step in GRIDS]
+    blocks.append([scoring.regional_score(region) for region in REGION_LABELS + ["Select"]])
+    blocks.append([scoring.soil_score(soil) for soil in SOIL_LABELS + ["Select"]])
+    return np.vstack(blocks)
+
+def fingerprint():
+    """Digest of everything the table is built from: grids, labels, crop catalog and scoring constants"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([TABLE_VERSION, GRIDS, REGION_LABELS, SOIL_LABELS, crop_catalog.CROP_NAMES,
+                              scoring.REGIONAL_PREFERENCES, scoring.MAX_POINTS, scoring.RANGE_POINTS,
+                              scoring.RANGE_SLOPES, scoring.NUTRIENT_POINTS, scoring.NUTRIENT_SLOPE,
+                              scoring.INPUT_FACTORS], sort_keys=True).encode('utf-8'))
+    for array in (crop_catalog.CATALOG, scoring.REGION_POINTS, scoring.SOIL_POINTS):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+def _fingerprint_path(path):
+    return f"{path}.fingerprint"
+
+def save(path=DEFAULT_PATH):
+    """Build the table and write it as a .npy file, with its fingerprint alongside"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.save(path, build())
+    with open(_fingerprint_path(path), 'w', encoding='utf-8') as f:
+        f.write(fingerprint())
+    return path
+
+def load(path=DEFAULT_PATH):
+    """
+    Memory-map the table at path, or build it in memory if the file is
+    missing or was built from a different catalog or scoring model.
+    """
+    if os.path.exists(path):
+        try:
+            with open(_fingerprint_path(path), encoding='utf-8') as f:
+                saved = f.read().strip()
+        except OSError:
+            saved = None
+        if saved == fingerprint():
+            table = np.load(path, mmap_mode='r')
+            if table.shape == (ROW_COUNT, len(crop_catalog.CROP_NAMES)):
+                return table
+        logger.warning("%s is out of date; scoring from a table built in memory. "
+                       "Run python score_table.py to rebuild it.", path)
+    return build()
+
+def _grid_row(factor, value):
+    """Row index of value in the factor's grid, or None if it is not a grid point"""
+    first, start, step, count = LAYOUT[factor]
+    index = int(round((value - start) / step))
+    if 0 <= index < count and abs(start + index * step - value) < 1e-9:
+        return first + index
+    return None
+
+def rows_for(soil_type, ph, nitrogen, phosphorus, potassium, temperature, rainfall, region):
+    """
+    Return {factor: table row} for one farm, or None if any input is off
+    the slider grids.
+    """
+    inputs = {'ph': ph, 'nitrogen': nitrogen, 'phosphorus': phosphorus, 'potassium': potassium,
+              'temperature': temperature, 'rainfall': rainfall}
+    rows = {}
+    for factor, *_ in GRIDS:
+        rows[factor] = _grid_row(factor, inputs[scoring.INPUT_FACTORS[factor][1]])
+        if rows[factor] is None:
+            return None
+    rows['regional_preference'] = LAYOUT['regional_preference'][0] + scoring.region_code(region)
+    rows['soil_type'] = LAYOUT['soil_type'][0] + int(SOIL_ROWS[scoring.soil_code(soil_type)])
+    return rows
+
+def lookup(table, soil_type, ph, nitrogen, phosphorus, potassium, temperature, rainfall, region):
+    """
+    Return the same factor scores as scoring.farm_scores by gathering rows
+    from the table, or None if any input is off the slider grids.
+    """
+    rows = rows_for(soil_type, ph, nitrogen, phosphorus, potassium, temperature, rainfall, region)
+    if rows is None:
+        return None
+    gathered = table[list(rows.values())]
+    return dict(zip(rows, gathered))
+
+if __name__ == "__main__":
+    print(f"Wrote {save(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH)}")
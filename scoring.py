@@ -0,0 +1,127 @@
+import numpy as np
+
+import crop_catalog
+
+# Vectorized factor scores for the app's recommendation model. Every function
+# scores all catalog crops at once and broadcasts over arrays of farm values,
+# returning arrays with a trailing crop axis.
+
+# Regional crop preferences
+REGIONAL_PREFERENCES = {
+    "Punjab": ["Wheat", "Rice", "Cotton", "Maize", "Sugarcane"],
+    "Haryana": ["Wheat", "Rice", "Cotton", "Mustard", "Bajra"],
+    "Uttar Pradesh": ["Wheat", "Rice", "Sugarcane", "Potato", "Pulses"],
+    "Maharashtra": ["Cotton", "Soybean", "Pulses", "Sugarcane", "Groundnut"],
+    "Karnataka": ["Rice", "Cotton", "Pulses", "Coffee", "Sugarcane"],
+    "Tamil Nadu": ["Rice", "Sugarcane", "Cotton", "Groundnut", "Coconut"],
+    "Andhra Pradesh": ["Rice", "Cotton", "Chilli", "Groundnut", "Tobacco"],
+    "Gujarat": ["Cotton", "Groundnut", "Wheat", "Pulses", "Castor"],
+    "Odisha": ["Rice", "Pulses", "Oilseeds", "Millets", "Jute"],
+    "Jharkhand": ["Rice", "Pulses", "Oilseeds", "Maize", "Wheat"],
+    "West Bengal": ["Rice", "Jute", "Tea", "Potato", "Wheat"],
+    "Bihar": ["Rice", "Wheat", "Maize", "Pulses", "Sugarcane"]
+}
+
+# Integer codes of the regions, the rows of REGION_POINTS
+REGION_NAMES = list(REGIONAL_PREFERENCES)
+REGION_INDEX = {region: i for i, region in enumerate(REGION_NAMES)}
+
+# Maximum points for each factor in a recommendation's 'details'
+MAX_POINTS = {
+    'regional_preference': 30,
+    'soil_type': 25,
+    'ph_suitability': 15,
+    'temperature_suitability': 10,
+    'rainfall_suitability': 10,
+    'nutrient_suitability': 25
+}
+
+# Full points inside the optimal range, minus (below, above) points per unit outside it
+RANGE_POINTS = {'ph': 15, 'temp': 10, 'rainfall': 10}
+RANGE_SLOPES = {'ph': (5, 5), 'temp': (0.5, 0.5), 'rainfall': (0.02, 0.01)}
+
+# Full points inside the optimal range, minus NUTRIENT_SLOPE points per unit
+# of distance from the middle of the range outside it
+NUTRIENT_POINTS = {'n': 8, 'p': 8, 'k': 9}
+NUTRIENT_SLOPE = 0.2
+
+# Factor scores returned by farm_scores, nutrients kept separate
+FACTORS = ['regional_preference', 'soil_type', 'ph_suitability', 'temperature_suitability',
+           'rainfall_suitability', 'nitrogen', 'phosphorus', 'potassium']
+
+def range_score(factor, values):
+    """Score values for a 'ph', 'temp' or 'rainfall' range against every crop"""
+    x = np.asarray(values, dtype=float)[..., None]
+    below = np.maximum(crop_catalog.CATALOG[f'{factor}_min'] - x, 0)
+    above = np.maximum(x - crop_catalog.CATALOG[f'{factor}_max'], 0)
+    below_slope, above_slope = RANGE_SLOPES[factor]
+    return np.maximum(0, RANGE_POINTS[factor] - below * below_slope - above * above_slope)
+
+def nutrient_score(factor, values):
+    """Score values for an 'n', 'p' or 'k' range against every crop"""
+    x = np.asarray(values, dtype=float)[..., None]
+    inside = (crop_catalog.CATALOG[f'{factor}_min'] <= x) & (x <= crop_catalog.CATALOG[f'{factor}_max'])
+    points = NUTRIENT_POINTS[factor]
+    outside = np.maximum(0, points - np.abs(x - crop_catalog.CATALOG[f'{factor}_mid']) * NUTRIENT_SLOPE)
+    return np.where(inside, points, outside)
+
+def _region_points():
+    points = np.zeros((len(REGION_NAMES) + 1, len(crop_catalog.CROP_NAMES)))
+    for region, crops in REGIONAL_PREFERENCES.items():
+        for name in crops:
+            if name in crop_catalog.CROP_INDEX:
+                points[REGION_INDEX[region], crop_catalog.CROP_INDEX[name]] = MAX_POINTS['regional_preference']
+    points.flags.writeable = False
+    return points
+
+# Region x crop regional-preference points; the last row (no points) is for "Select" and unknown regions
+REGION_POINTS = _region_points()
+
+# Soil x crop points for a match with the crop's preferred soil; the last row is for "Select" and unknown soils
+SOIL_POINTS = np.where(crop_catalog.SOIL_PREFERRED, float(MAX_POINTS['soil_type']), 0.0)
+SOIL_POINTS.flags.writeable = False
+
+def region_code(region):
+    """Row of a region in REGION_POINTS"""
+    return REGION_INDEX.get(region, len(REGION_NAMES))
+
+def soil_code(soil_type):
+    """Row of a soil type in SOIL_POINTS, matched case-insensitively"""
+    return crop_catalog.SOIL_INDEX_LOWER.get(soil_type.lower(), len(crop_catalog.SOIL_NAMES))
+
+def regional_score(region):
+    """Score one region against every crop"""
+    return REGION_POINTS[region_code(region)]
+
+def soil_score(soil_type):
+    """Score one soil type against every crop's preferred soil"""
+    return SOIL_POINTS[soil_code(soil_type)]
+
+# Range and nutrient factors with the catalog range and farm input each one scores
+INPUT_FACTORS = {
+    'ph_suitability': ('ph', 'ph'),
+    'temperature_suitability': ('temp', 'temperature'),
+    'rainfall_suitability': ('rainfall', 'rainfall'),
+    'nitrogen': ('n', 'nitrogen'),
+    'phosphorus': ('p', 'phosphorus'),
+    'potassium': ('k', 'potassium')
+}
+
+def factor_score(factor, values):
+    """Score input values for one of the INPUT_FACTORS against every crop"""
+    catalog_factor, _ = INPUT_FACTORS[factor]
+    if catalog_factor in RANGE_POINTS:
+        return range_score(catalog_factor, values)
+    return nutrient_score(catalog_factor, values)
+
+def farm_scores(soil_type, ph, nitrogen, phosphorus, potassium, temperature, rainfall, region):
+    """Return a dict of FACTORS to per-crop score arrays for one farm"""
+    inputs = {'ph': ph, 'nitrogen': nitrogen, 'phosphorus': phosphorus, 'potassium': potassium,
+              'temperature': temperature, 'rainfall': rainfall}
+    scores = {
+        'regional_preference': regional_score(region),
+        'soil_type': soil_score(soil_type)
+    }
+    for factor, (_, name) in INPUT_FACTORS.items():
+        scores[factor] = factor_score(factor, inputs[name])
+    return scores
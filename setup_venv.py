@@ -12,13 +12,19 @@ def setup_venv():
     # Determine the pip path based on OS
     if os.name == 'nt':  # Windows
         pip_path = os.path.join('venv', 'Scripts', 'pip.exe')
+        python_path = os.path.join('venv', 'Scripts', 'python.exe')
         activate_cmd = 'venv\\Scripts\\activate'
     else:  # macOS/Linux
         pip_path = os.path.join('venv', 'bin', 'pip')
+        python_path = os.path.join('venv', 'bin', 'python')
         activate_cmd = 'source venv/bin/activate'
     
     print("Installing dependencies...")
     subprocess.run([pip_path, 'install', '-r', 'requirements.txt'])
+
+    # Synthetic normals; rebuild with python climate.py --csv for measured ones
+    print("Building climate normals...")
+    subprocess.run([python_path, 'climate.py'])
     
     print("\nVirtual environment setup complete!")
     print(f"To activate the virtual environment, run: {activate_cmd}")
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import socket
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import api_server
+import coalescer
+import recommendation
+
+FARM = {'soil_type': 'Loam', 'ph': 6.5, 'nitrogen': 50, 'phosphorus': 40, 'potassium': 60,
+        'temperature': 25, 'rainfall': 800, 'humidity': 60, 'region': 'Punjab'}
+
+def post(path, payload):
+    body = payload if isinstance(payload, str) else json.dumps(payload)
+    return api_server.handle_post(path, body.encode())
+
+@pytest.mark.parametrize("path", ['/recommend', '/crops'])
+@pytest.mark.parametrize("field, value", [
+    ('soil_type', 3), ('region', ['Punjab']), ('region', None), ('ph', 'acid'), ('ph', True), ('rainfall', {})
+])
+def test_invalid_field_is_a_bad_request(path, field, value):
+    status, body = post(path, {**FARM, field: value})
+    assert status == 400
+    assert f"'{field}'" in body['error']
+
+@pytest.mark.parametrize("token", ['NaN', 'Infinity', '-Infinity'])
+def test_non_finite_number_is_a_bad_request(token):
+    status, body = post('/crops', json.dumps(FARM).replace('6.5', token))
+    assert status == 400
+    assert "'ph' must be a finite number" in body['error']
+
+def test_batch_names_the_field():
+    status, body = post('/crops/batch', {'farms': [FARM, {**FARM, 'region': 7}]})
+    assert status == 400
+    assert "'region'" in body['error']
+
+def test_valid_farm():
+    status, body = post('/crops', {**FARM, 'top_n': 2, 'explain': False})
+    assert status == 200
+    assert len(body) == 2
+
+def test_recommend_scores_exact_inputs():
+    farm = {**FARM, 'ph': 5.96}
+    status, body = post('/recommend', farm)
+    assert status == 200
+    assert [rec['score'] for rec in body] == [rec['score'] for rec in recommendation.compute_best_crops(**farm)]
+    assert body[0]['score'] != recommendation.predict_best_crop(**farm)[0]['score']
+
+@pytest.mark.parametrize("value, length", [(None, 0), ('', 0), ('17', 17), (' 42 ', 42)])
+def test_content_length(value, length):
+    assert api_server.parse_content_length(value) == length
+
+@pytest.mark.parametrize("value", ['-1', 'abc', '1.5', '+5', '1_0'])
+def test_bad_content_length(value):
+    with pytest.raises(api_server.BadRequest):
+        api_server.parse_content_length(value)
+
+def _raw_request(port, content_length):
+    with socket.create_connection(('127.0.0.1', port), timeout=5) as sock:
+        sock.sendall(f"POST /crops HTTP/1.1\r\nHost: x\r\nContent-Length: {content_length}\r\n\r\n".encode())
+        # Both servers close the connection after a request they cannot frame
+        chunks = []
+        while chunk := sock.recv(4096):
+            chunks.append(chunk)
+        return b''.join(chunks).decode('latin-1')
+
+@pytest.mark.parametrize("content_length", ['-1', 'abc'])
+def test_threaded_server_rejects_bad_content_length(content_length):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), api_server.RecommendationHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        response = _raw_request(server.server_address[1], content_length)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert response.startswith("HTTP/1.1 400")
+    assert "Content-Length must be" in response
+
+@pytest.mark.parametrize("content_length", ['-1', 'abc'])
+def test_coalescing_server_rejects_bad_content_length(content_length):
+    async def scenario():
+        server = api_server.CoalescingServer(coalescer.CropRequestCoalescer())
+        listener = await asyncio.start_server(server.handle_connection, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            return await asyncio.to_thread(_raw_request, port, content_length)
+        finally:
+            listener.close()
+            await server.coalescer.close()
+
+    response = asyncio.run(scenario())
+    assert response.startswith("HTTP/1.1 400")
+    assert "Connection: close" in response
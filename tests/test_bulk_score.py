@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+
+import bulk_score
+
+CSV = """card,soil_type,region,ph,nitrogen,phosphorus,potassium,temperature,rainfall,humidity
+A,Loam,Punjab,6.5,50,40,60,25,800,60
+B,Loam,Punjab,,50,40,60,25,800,60
+C,Clay,Bihar,n/a,50,40,60,25,800,60
+D,Clay,Bihar,7.0,80,40,60,28,1200,70
+"""
+
+def test_rows_with_missing_inputs_are_left_unranked(tmp_path):
+    source = tmp_path / "cards.csv"
+    source.write_text(CSV)
+    output = tmp_path / "ranked.csv"
+    rows, invalid, _ = bulk_score.run(str(source), str(output), top_n=2, chunk_size=3, keep=['card'])
+    ranked = pd.read_csv(output)
+    assert (rows, invalid) == (4, 2)
+    assert ranked['card'].tolist() == ['A', 'B', 'C', 'D']
+    blank = ranked['card'].isin(['B', 'C'])
+    assert ranked.loc[blank, ['crop_1', 'score_1', 'crop_2', 'score_2']].isna().all().all()
+    assert ranked.loc[~blank, ['crop_1', 'score_1', 'crop_2', 'score_2']].notna().all().all()
+
+def test_report_counts_invalid_rows(capsys):
+    bulk_score.report(10, 1.0, invalid=3)
+    assert "3 rows not ranked" in capsys.readouterr().err
+
+def test_text_in_numeric_columns_leaves_rows_unranked(tmp_path):
+    source = tmp_path / "cards.csv"
+    source.write_text(CSV.replace("D,Clay,Bihar,7.0", 'D,Clay,Bihar,"6,5"'))
+    output = tmp_path / "ranked.csv"
+    rows, invalid, _ = bulk_score.run(str(source), str(output), top_n=2, chunk_size=10, keep=['card'])
+    assert (rows, invalid) == (4, 3)
+    assert pd.read_csv(output)['crop_1'].notna().tolist() == [True, False, False, False]
+
+def test_chunk_with_an_all_text_column(tmp_path):
+    source = tmp_path / "cards.csv"
+    source.write_text(CSV.replace("D,Clay,Bihar,7.0,80", "D,Clay,Bihar,7.0,high"))
+    output = tmp_path / "ranked.csv"
+    rows, invalid, _ = bulk_score.run(str(source), str(output), top_n=2, chunk_size=3, keep=['card'])
+    assert (rows, invalid) == (4, 3)
+    assert pd.read_csv(output)['crop_1'].notna().tolist() == [True, False, False, False]
+
+def test_parquet_chunk_of_unranked_rows(tmp_path):
+    pytest.importorskip("pyarrow")
+    lines = CSV.splitlines()
+    valid = lines[1].replace("A,", "{},", 1)
+    blank = lines[2].replace("B,", "{},", 1)
+    source = tmp_path / "cards.csv"
+    source.write_text("\n".join([lines[0]] + [valid.format(i) for i in range(3)]
+                                + [blank.format(i) for i in range(3, 6)]) + "\n")
+    output = tmp_path / "ranked.parquet"
+    rows, invalid, _ = bulk_score.run(str(source), str(output), top_n=2, chunk_size=3, keep=['card'])
+    ranked = pd.read_parquet(output)
+    assert (rows, invalid) == (6, 3)
+    assert list(ranked.columns) == bulk_score.output_columns(2, ['card'])
+    assert ranked['crop_1'].notna().tolist() == [True] * 3 + [False] * 3
+
+@pytest.mark.parametrize("top_n", [0, -1])
+def test_top_n_must_be_positive(tmp_path, top_n):
+    source = tmp_path / "cards.csv"
+    source.write_text(CSV)
+    with pytest.raises(ValueError, match="top_n"):
+        bulk_score.run(str(source), str(tmp_path / "ranked.csv"), top_n=top_n)
+    assert not (tmp_path / "ranked.csv").exists()
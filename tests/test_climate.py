@@ -0,0 +1,28 @@
+import numpy as np
+
+import climate
+import crop_data
+
+def test_missing_store_is_not_built_on_request(tmp_path, monkeypatch):
+    monkeypatch.setattr(climate, '_store', None)
+    path = str(tmp_path / 'normals.bin')
+    assert climate.get_store(path) is None
+    assert not (tmp_path / 'normals.bin').exists()
+
+def test_scoring_without_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(climate, '_store', None)
+    monkeypatch.setattr(climate, 'DEFAULT_PATH', str(tmp_path / 'normals.bin'))
+    assert climate.baseline('Punjab') is None
+    farms = {'region': ['Punjab'], 'soil_type': ['Loam'], 'ph': [6.5], 'nitrogen': [50], 'phosphorus': [40],
+             'potassium': [60], 'temperature': [25], 'rainfall': [800], 'humidity': [60]}
+    seasonal = crop_data.calculate_suitability_scores(farms, crop_data.seasonal_climate(farms))['score']
+    assert np.array_equal(seasonal, crop_data.calculate_suitability_scores(farms)['score'])
+
+def test_store_records_whether_normals_are_synthetic(tmp_path):
+    assert climate.ClimateNormals(climate.build(str(tmp_path / 'synthetic.bin'))).synthetic
+    source = tmp_path / 'normals.csv'
+    source.write_text("region,day,temperature,rainfall,humidity\n"
+                      + "".join(f"Goa,{day},27,8,75\n" for day in range(1, climate.DAYS + 1)))
+    store = climate.ClimateNormals(climate.build(str(tmp_path / 'measured.bin'), str(source)))
+    assert not store.synthetic
+    assert store.daily('goa')[0].tolist() == [27, 8, 75]
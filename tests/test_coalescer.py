@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+import coalescer
+import crop_data
+
+FARM = dict(soil_type='Loam', ph=6.5, nitrogen=50, phosphorus=40, potassium=60,
+            temperature=25, rainfall=800, humidity=60, region='Punjab')
+
+def crops_of(results):
+    return [(result['crop'], result['score']) for result in results]
+
+async def _gather(farms):
+    batcher = coalescer.CropRequestCoalescer(max_batch_size=64, max_wait_ms=20)
+    try:
+        return await asyncio.gather(*(batcher.predict_best_crops(**farm) for farm in farms),
+                                    return_exceptions=True), batcher
+    finally:
+        await batcher.close()
+
+def _farms(bad_index, **bad_fields):
+    farms = [dict(FARM, ph=5.0 + i / 10) for i in range(10)]
+    farms[bad_index].update(bad_fields)
+    return farms
+
+def test_malformed_request_is_rejected_alone():
+    farms = _farms(3, region={'a': 1})
+    results, batcher = asyncio.run(_gather(farms))
+    assert isinstance(results[3], TypeError)
+    for i, result in enumerate(results):
+        if i != 3:
+            assert crops_of(result) == crops_of(crop_data.predict_best_crops(**farms[i]))
+    assert batcher.requests == 9
+
+@pytest.mark.parametrize('field, value', [('ph', float('nan')), ('ph', '6.5'), ('ph', True),
+                                          ('soil_type', 3), ('region', ['Punjab'])])
+def test_validation(field, value):
+    farm = dict(FARM, **{field: value})
+    with pytest.raises((TypeError, ValueError), match=field):
+        coalescer.validate_inputs(tuple(farm[name] for name in crop_data.FARM_INPUTS), 3)
+
+def test_validation_of_top_n():
+    with pytest.raises(ValueError, match='top_n'):
+        coalescer.validate_inputs(tuple(FARM[name] for name in crop_data.FARM_INPUTS), 0)
+
+def test_failed_batch_is_rescored_per_request(monkeypatch):
+    # Let the bad request through validation so it reaches the shared batch
+    monkeypatch.setattr(coalescer, 'validate_inputs', lambda inputs, top_n: None)
+    farms = _farms(7, region={'a': 1})
+    results, batcher = asyncio.run(_gather(farms))
+    assert isinstance(results[7], Exception)
+    for i, result in enumerate(results):
+        if i != 7:
+            assert crops_of(result) == crops_of(crop_data.predict_best_crops(**farms[i]))
+    assert batcher.batches == 1
+
+def test_close_cancels_requests_in_a_gathering_batch():
+    async def scenario():
+        # A long wait keeps the first requests in the open batch when close() runs
+        batcher = coalescer.CropRequestCoalescer(max_batch_size=64, max_wait_ms=10_000)
+        tasks = [asyncio.ensure_future(batcher.predict_best_crops(**FARM)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        assert len(batcher._batch) == 3
+        await batcher.close()
+        return await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 1)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+import climate
+import crop_catalog
+import crop_data
+
+@pytest.fixture(params=[crop_catalog.FULL_SORT_MAX_CROPS, 0], ids=['full_sort', 'partition'])
+def sort_limit(request, monkeypatch):
+    monkeypatch.setattr(crop_catalog, 'FULL_SORT_MAX_CROPS', request.param)
+
+def test_top_k_ranks_nan_last(sort_limit):
+    scores = np.array([[3.0, np.nan, 5.0, 1.0, np.nan],
+                       [np.nan] * 5,
+                       [2.0, 2.0, 9.0, 2.0, 0.0]])
+    assert crop_catalog.top_k(scores, 4).tolist() == [[2, 0, 3, 1], [0, 1, 2, 3], [2, 0, 1, 3]]
+
+def test_top_k_breaks_ties_in_catalog_order(sort_limit):
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 5, (200, 40)).astype(float)
+    expected = np.argsort(-scores, axis=-1, kind='stable')[:, :7]
+    assert np.array_equal(crop_catalog.top_k(scores, 7), expected)
+
+def test_batch_with_blank_ph(sort_limit):
+    farms = {'soil_type': ['Loam', 'Loam'], 'ph': [6.5, np.nan], 'nitrogen': [50, 50], 'phosphorus': [40, 40],
+             'potassium': [60, 60], 'temperature': [25, 25], 'rainfall': [800, 800], 'humidity': [60, 60],
+             'region': ['Punjab', 'Punjab']}
+    names, scores = crop_data.predict_best_crops_batch(farms, top_n=3)
+    assert names.shape == (2, 3)
+    assert np.isfinite(scores[0]).all() and np.isnan(scores[1]).all()
+
+def test_encode_treats_integers_as_labels():
+    index = {'Loam': 0, 'Clay': 1, 7: 2}
+    assert crop_catalog.encode([3, 7, 'Clay', None], index).tolist() == [3, 2, 1, 3]
+
+def test_encode_codes_maps_out_of_range_to_unknown():
+    index = {'Loam': 0, 'Clay': 1}
+    assert crop_catalog.encode([1, 0, 2, 27, -1], index, codes=True).tolist() == [1, 0, 2, 2, 2]
+    with pytest.raises(TypeError):
+        crop_catalog.encode(['Loam'], index, codes=True)
+
+def test_integer_regions_score_as_unknown():
+    farm = {'soil_type': 'Loam', 'ph': 6.5, 'nitrogen': 50, 'phosphorus': 40, 'potassium': 60,
+            'temperature': 25, 'rainfall': 800, 'humidity': 60}
+    farms = {column: [value] * 3 for column, value in farm.items()}
+    farms['region'] = [3, 27, 'Nowhere']
+    scores = crop_data.calculate_suitability_scores(farms)['score']
+    assert np.array_equal(scores[0], scores[2]) and np.array_equal(scores[1], scores[2])
+
+def test_seasonal_scoring_falls_back_for_regions_without_normals(tmp_path, monkeypatch):
+    monkeypatch.setattr(climate, '_store', climate.ClimateNormals(climate.build(str(tmp_path / 'normals.bin'))))
+    farm = {'soil_type': 'Loam', 'ph': 6.5, 'nitrogen': 50, 'phosphorus': 40, 'potassium': 60,
+            'temperature': 25, 'rainfall': 800, 'humidity': 60}
+    farms = {column: [value] * 2 for column, value in farm.items()}
+    farms['region'] = ['Punjab', 'Atlantis']
+    months = crop_data.seasonal_climate(farms)
+    assert np.isfinite(months[0]).all() and np.isnan(months[1]).all()
+    seasonal = crop_data.calculate_suitability_scores(farms, months)['score']
+    plain = crop_data.calculate_suitability_scores(farms)['score']
+    assert np.array_equal(seasonal[1], plain[1])
+    assert not np.array_equal(seasonal[0], plain[0])
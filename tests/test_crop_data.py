@@ -0,0 +1,23 @@
+import json
+import pickle
+
+import crop_data
+from lazy_record import LazyRecord
+
+FARM = dict(soil_type='Loam', ph=6.5, nitrogen=50, phosphorus=40, potassium=60,
+            temperature=25, rainfall=800, humidity=60, region='Punjab')
+
+def test_records_are_plain_dicts_by_default():
+    results = crop_data.predict_best_crops(**FARM)
+    assert all(type(result) is dict for result in results)
+    assert all({'reasons', 'analysis'} <= set(result) for result in results)
+    assert json.loads(json.dumps(results)) == results
+
+def test_lazy_records_match_and_pickle():
+    eager = crop_data.predict_best_crops(**FARM)
+    lazy = crop_data.predict_best_crops(**FARM, lazy=True)
+    assert all(isinstance(result, LazyRecord) for result in lazy)
+    assert 'reasons' not in dict(lazy[0])
+    restored = pickle.loads(pickle.dumps(lazy))
+    assert [dict(result.resolve()) for result in restored] == eager
+    assert [dict(result.resolve()) for result in lazy] == eager
@@ -0,0 +1,54 @@
+import gc
+import tracemalloc
+
+import pytest
+
+import profiling
+
+@pytest.fixture(autouse=True)
+def no_tracing():
+    if tracemalloc.is_tracing():
+        pytest.skip("tracemalloc is already running")
+    yield
+    gc.collect()
+    assert not tracemalloc.is_tracing()
+
+@pytest.mark.parametrize("env, query, enabled", [
+    (None, "1", False), ("0", "1", False), ("1", None, True),
+    ("query", None, False), ("query", "1", True), ("query", "0", False)
+])
+def test_query_param_needs_env_flag(monkeypatch, env, query, enabled):
+    if env is None:
+        monkeypatch.delenv(profiling.ENV_FLAG, raising=False)
+    else:
+        monkeypatch.setenv(profiling.ENV_FLAG, env)
+    assert profiling.enabled_for(query) is enabled
+
+def test_finish_stops_tracing():
+    profiler = profiling.RerunProfiler(True)
+    with profiler.stage("work"):
+        data = [0] * 100_000
+    assert tracemalloc.is_tracing()
+    profiler.finish()
+    assert not tracemalloc.is_tracing()
+    assert profiler.stages[0]['alloc_kb'] > 700
+    del data
+
+def test_one_rerun_traces_at_a_time():
+    first = profiling.RerunProfiler(True)
+    second = profiling.RerunProfiler(True)
+    with second.stage("work"):
+        pass
+    assert first.tracing and not second.tracing
+    assert second.stages[0]['alloc_kb'] is None and 'wall_ms' in second.stages[0]
+    first.finish()
+    second.finish()
+    assert profiling.RerunProfiler(True).tracing
+
+def test_abandoned_rerun_releases_tracing():
+    profiling.RerunProfiler(True)
+    gc.collect()
+    assert not tracemalloc.is_tracing()
+    profiler = profiling.RerunProfiler(True)
+    assert profiler.tracing
+    profiler.finish()
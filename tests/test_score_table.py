@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+import score_table
+import scoring
+
+@pytest.fixture(scope='module')
+def table():
+    return score_table.build()
+
+@pytest.mark.parametrize("farm", [
+    ('Loam', 6.5, 50, 40, 60, 25, 800, 'Punjab'),
+    ('clay', 4.0, 0, 200, 0, 0, 2000, 'Bihar'),
+    ('Peaty', 9.0, 200, 0, 200, 45, 0, 'Select'),
+    ('Sandy', 7.3, 101, 17, 88, 33, 1234, 'Atlantis')
+])
+def test_lookup_matches_farm_scores(table, farm):
+    looked_up = score_table.lookup(table, *farm)
+    computed = scoring.farm_scores(*farm)
+    assert set(looked_up) == set(computed)
+    for factor, scores in computed.items():
+        assert np.allclose(looked_up[factor], scores), factor
+
+def test_off_grid_inputs_are_not_looked_up(table):
+    assert score_table.lookup(table, 'Loam', 6.55, 50, 40, 60, 25, 800, 'Punjab') is None
+
+def test_load_rebuilds_a_stale_table(tmp_path, monkeypatch):
+    path = str(tmp_path / 'table.npy')
+    score_table.save(path)
+    assert isinstance(score_table.load(path), np.memmap)
+    monkeypatch.setitem(scoring.RANGE_POINTS, 'ph', 20)
+    assert not isinstance(score_table.load(path), np.memmap)
+
+def test_load_rejects_a_table_without_fingerprint(tmp_path):
+    path = str(tmp_path / 'table.npy')
+    np.save(path, np.zeros_like(score_table.build()))
+    assert score_table.load(path).any()
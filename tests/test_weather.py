@@ -0,0 +1,71 @@
+import pytest
+
+import weather
+
+class CountingProvider(weather.MockProvider):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def forecast(self, location, days=weather.FORECAST_DAYS):
+        self.calls.append((location, days))
+        return super().forecast(location, days)
+
+def test_cache_is_keyed_on_days(tmp_path):
+    upstream = CountingProvider()
+    provider = weather.CachedProvider(upstream, cache_dir=str(tmp_path))
+    assert len(provider.forecast('Punjab', 3)['daily']) == 3
+    assert len(provider.forecast('punjab', 14)['daily']) == 14
+    assert len(provider.forecast('Punjab', 3)['daily']) == 3
+    assert upstream.calls == [('Punjab', 3), ('punjab', 14)]
+    assert len(provider.cached('Punjab', 14)[1]['daily']) == 14
+    assert provider.cached('Punjab') is None
+
+def test_disk_cache_is_keyed_on_days(tmp_path):
+    weather.CachedProvider(CountingProvider(), cache_dir=str(tmp_path)).forecast('Punjab', 3)
+    upstream = CountingProvider()
+    provider = weather.CachedProvider(upstream, cache_dir=str(tmp_path))
+    assert len(provider.forecast('Punjab', 3)['daily']) == 3
+    assert len(provider.forecast('Punjab', 7)['daily']) == 7
+    assert upstream.calls == [('Punjab', 7)]
+    assert provider.stats['disk_hits'] == 1
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+class FakeSession:
+    def __init__(self, body):
+        self.body = body
+
+    def get(self, url, params=None, timeout=None):
+        return FakeResponse(self.body)
+
+DAY = {'date': '2024-06-01', 'temperature': 26.1, 'rainfall': 3.2, 'humidity': 58}
+GOOD = {'temperature': 25, 'humidity': 60, 'rainfall': 800, 'daily': [DAY]}
+
+@pytest.mark.parametrize("body", [
+    ['not', 'an', 'object'], 'text', None,
+    {k: v for k, v in GOOD.items() if k != 'daily'},
+    dict(GOOD, daily=[]), dict(GOOD, daily={'date': '2024-06-01'}),
+    dict(GOOD, daily=[DAY, 'day']), dict(GOOD, daily=[{'date': '2024-06-01'}])
+])
+def test_malformed_forecast_is_unavailable(body):
+    provider = weather.HttpProvider('http://forecast.invalid', session=FakeSession(body))
+    with pytest.raises(weather.WeatherUnavailable):
+        provider.forecast('Punjab')
+
+def test_malformed_forecast_serves_stale_entry(tmp_path):
+    session = FakeSession(GOOD)
+    provider = weather.CachedProvider(weather.HttpProvider('http://forecast.invalid', session=session),
+                                      ttl=0, cache_dir=str(tmp_path))
+    assert provider.forecast('Punjab') == GOOD
+    session.body = dict(GOOD, daily=[])
+    assert provider.forecast('Punjab') == GOOD
+    assert provider.stats['stale_served'] == 1
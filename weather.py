@@ -1,10 +1,285 @@
-def get_weather_forecast(location):
-    """Get mock weather forecast data"""
-    # In a real application, this would fetch data from a weather API
-    return {
-        'location': location,
-        'temperature': 25,
-        'humidity': 60,
-        'rainfall': 800,
-        'forecast': 'Partly cloudy with a chance of rain'
-    }
\ No newline at end of file
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+
+import climate
+
+# Weather forecasts per location. A provider returns a forecast dict:
+#
+#   {'location': 'Punjab', 'temperature': 25, 'humidity': 60, 'rainfall': 800,
+#    'forecast': 'Partly cloudy...', 'daily': [{'date': '2024-06-01',
+#    'temperature': 26.1, 'rainfall': 3.2, 'humidity': 58}, ...]}
+#
+# where 'rainfall' is the annual total in mm (as on the app's slider) and each
+# daily entry has the day's mean temperature, rainfall in mm and humidity.
+# Providers are wrapped in a CachedProvider, so each location is fetched at
+# most once per TTL however many users ask for it.
+#
+#   VARUN_WEATHER_URL=http://localhost:8765 streamlit run app.py
+#
+# points the app at an HTTP forecast service (python weather_mock_server.py
+# serves one offline); without it the built-in MockProvider is used.
+
+FORECAST_DAYS = 7
+
+# Seconds a forecast is served from the cache before it is fetched again
+DEFAULT_TTL = 3 * 3600
+
+CACHE_DIR = os.environ.get("VARUN_WEATHER_CACHE", os.path.join(".cache", "weather"))
+
+# (connect, read) timeouts in seconds for upstream requests
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# Upstream responses retried with backoff before a fetch fails
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Keys every forecast and every entry of its 'daily' list must have
+FORECAST_KEYS = {'temperature', 'humidity', 'rainfall', 'daily'}
+DAILY_KEYS = {'date', 'temperature', 'rainfall', 'humidity'}
+
+class WeatherUnavailable(Exception):
+    """Raised when a forecast cannot be fetched and nothing is cached"""
+
+def location_key(location):
+    """Cache key of a location: 'uttar  pradesh' and 'Uttar Pradesh' are the same district"""
+    return ' '.join(str(location).split()).lower()
+
+class MockProvider:
+    """
+    Offline forecasts: the region's climate normals (climate.py), or the
+    old fixed values for places the store does not have, with day-to-day
+    variation seeded by the location and date so every call for the same
+    day agrees.
+    """
+
+    def __init__(self, temperature=25, humidity=60, rainfall=800):
+        self.temperature = temperature
+        self.humidity = humidity
+        self.rainfall = rainfall
+
+    def forecast(self, location, days=FORECAST_DAYS):
+        today = datetime.date.today()
+        normals = climate.baseline(location, today, days)
+        if normals is None:
+            temperature, humidity, rainfall = self.temperature, self.humidity, self.rainfall
+            normals = [{'date': (today + datetime.timedelta(days=i)).isoformat(), 'temperature': temperature,
+                        'rainfall': rainfall / 365, 'humidity': humidity} for i in range(days)]
+        else:
+            store = climate.get_store()
+            temperature, _, humidity = (round(value) for value in store.window(location, today, 1)[0].tolist())
+            rainfall = round(float(store.daily(location)[:, climate.RAINFALL].sum()))
+
+        daily = []
+        for normal in normals:
+            digest = hashlib.blake2b(f"{location_key(location)}|{normal['date']}".encode(), digest_size=6).digest()
+            a, b, c = (int.from_bytes(digest[j:j + 2], 'big') / 65535 for j in (0, 2, 4))
+            daily.append({
+                'date': normal['date'],
+                'temperature': round(normal['temperature'] - 3 + 6 * a, 1),
+                'rainfall': round(max(0.0, normal['rainfall'] * (0.5 + b) + 5 * (b - 0.7)), 1),
+                'humidity': round(min(100.0, normal['humidity'] - 10 + 20 * c), 1)
+            })
+        return {
+            'location': location,
+            'temperature': temperature,
+            'humidity': humidity,
+            'rainfall': rainfall,
+            'forecast': 'Partly cloudy with a chance of rain',
+            'daily': daily
+        }
+
+def check_forecast(location, forecast):
+    """Raise WeatherUnavailable unless forecast is a forecast dict as described at the top of this module"""
+    if not isinstance(forecast, dict):
+        raise WeatherUnavailable(f"forecast for {location!r} is not a JSON object")
+    missing = FORECAST_KEYS - set(forecast)
+    if missing:
+        raise WeatherUnavailable(f"forecast for {location!r} has no {', '.join(sorted(missing))}")
+    daily = forecast['daily']
+    if not isinstance(daily, list) or not daily:
+        raise WeatherUnavailable(f"forecast for {location!r} has no daily entries")
+    for day in daily:
+        if not isinstance(day, dict) or not DAILY_KEYS <= set(day):
+            raise WeatherUnavailable(f"forecast for {location!r} has a daily entry without "
+                                     f"{', '.join(sorted(DAILY_KEYS))}")
+
+class HttpProvider:
+    """
+    Fetch forecasts from an HTTP service as GET <base_url>/forecast?location=&days=
+    returning a forecast dict as JSON. One pooled requests session is shared
+    by all threads; failed connections and RETRY_STATUSES are retried with
+    exponential backoff.
+    """
+
+    def __init__(self, base_url, timeout=DEFAULT_TIMEOUT, retries=3, pool_size=10, session=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = session or self._session(retries, pool_size)
+
+    @staticmethod
+    def _session(retries, pool_size):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(total=retries, backoff_factor=0.3, status_forcelist=RETRY_STATUSES,
+                      allowed_methods=['GET'], raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def forecast(self, location, days=FORECAST_DAYS):
+        import requests
+
+        try:
+            response = self.session.get(f"{self.base_url}/forecast", params={'location': location, 'days': days},
+                                        timeout=self.timeout)
+            response.raise_for_status()
+            forecast = response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise WeatherUnavailable(f"forecast for {location!r} failed: {e}") from e
+        check_forecast(location, forecast)
+        return forecast
+
+    def close(self):
+        self.session.close()
+
+class CachedProvider:
+    """
+    Serve forecasts from memory, then from JSON files under cache_dir (shared
+    by every worker process on the host), and fetch from the wrapped provider
+    only when both are older than ttl seconds. Entries are kept per location
+    and number of days. Concurrent misses for the same entry wait for one
+    fetch. If a fetch fails, an expired forecast is served rather than none.
+    """
+
+    def __init__(self, provider, ttl=DEFAULT_TTL, cache_dir=CACHE_DIR):
+        self.provider = provider
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        # cache key -> (fetched at, forecast)
+        self._entries = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'fetches': 0, 'errors': 0, 'stale_served': 0}
+
+    @staticmethod
+    def _key(location, days):
+        return f"{location_key(location)}|{days}"
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}.json")
+
+    def _read_disk(self, key):
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry['fetched_at'], entry['forecast']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key, fetched_at, forecast):
+        if self.cache_dir is None:
+            return
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'location': key, 'fetched_at': fetched_at, 'forecast': forecast}, f)
+            os.replace(tmp, path)
+        except OSError:
+            # The memory cache still works without a writable cache directory
+            pass
+
+    def _fresh(self, entry):
+        return entry is not None and time.time() - entry[0] < self.ttl
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def cached(self, location, days=FORECAST_DAYS):
+        """(fetched at, forecast) for a location if cached, fresh or not, without fetching"""
+        key = self._key(location, days)
+        return self._entries.get(key) or self._read_disk(key)
+
+    def forecast(self, location, days=FORECAST_DAYS):
+        key = self._key(location, days)
+        entry = self._entries.get(key)
+        if self._fresh(entry):
+            self._count('memory_hits')
+            return entry[1]
+
+        with self._location_lock(key):
+            # Another thread may have fetched it while we waited
+            entry = self._entries.get(key)
+            if self._fresh(entry):
+                self._count('memory_hits')
+                return entry[1]
+            disk_entry = self._read_disk(key)
+            if self._fresh(disk_entry):
+                self._entries[key] = disk_entry
+                self._count('disk_hits')
+                return disk_entry[1]
+            return self._fetch(key, location, days, stale=entry or disk_entry)
+
+    def refresh(self, location, days=FORECAST_DAYS):
+        """Fetch a location from the wrapped provider and cache it, whatever the cache holds"""
+        key = self._key(location, days)
+        with self._location_lock(key):
+            return self._fetch(key, location, days, stale=self.cached(location, days))
+
+    def _location_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _fetch(self, key, location, days, stale=None):
+        try:
+            forecast = self.provider.forecast(location, days)
+        except WeatherUnavailable:
+            self._count('errors')
+            if stale is None:
+                raise
+            self._count('stale_served')
+            return stale[1]
+        fetched_at = time.time()
+        self._entries[key] = (fetched_at, forecast)
+        self._write_disk(key, fetched_at, forecast)
+        self._count('fetches')
+        return forecast
+
+    def clear(self):
+        """Forget the in-memory entries; files on disk are kept"""
+        with self._lock:
+            self._entries.clear()
+
+def default_provider():
+    """HttpProvider for $VARUN_WEATHER_URL if set, otherwise MockProvider, behind a CachedProvider"""
+    url = os.environ.get("VARUN_WEATHER_URL")
+    return CachedProvider(HttpProvider(url) if url else MockProvider())
+
+_provider = default_provider()
+
+def set_provider(provider):
+    """
+    Replace the process-wide forecast provider. Wrap it in CachedProvider
+    unless it does its own caching.
+    """
+    global _provider
+    _provider = provider
+
+def get_provider():
+    """Return the process-wide forecast provider"""
+    return _provider
+
+def get_weather_forecast(location, days=FORECAST_DAYS):
+    """Forecast for a location from the process-wide provider; raises WeatherUnavailable"""
+    return _provider.forecast(location, days)
@@ -0,0 +1,114 @@
+import argparse
+import json
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import weather
+
+# Local forecast service for testing weather.HttpProvider offline. It serves
+# weather.MockProvider's forecasts over the same API a real service must
+# offer, counts the requests it answers and can fail on purpose:
+#
+#   python weather_mock_server.py --port 8765 --fail-every 3
+#   VARUN_WEATHER_URL=http://localhost:8765 streamlit run app.py
+#
+# GET /forecast?location=Punjab&days=7   forecast JSON
+# GET /stats                             {'requests': ..., 'failures': ..., 'locations': {...}}
+
+logger = logging.getLogger("varun.weather_mock")
+
+class MockWeatherServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fail_every=0, provider=None):
+        super().__init__(address, MockWeatherHandler)
+        self.provider = provider or weather.MockProvider()
+        # Every fail_every-th forecast request gets a 503 (0 = never)
+        self.fail_every = fail_every
+        self.requests = 0
+        self.failures = 0
+        self.locations = {}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+class MockWeatherHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        server = self.server
+        if url.path == "/stats":
+            with server.lock:
+                stats = {'requests': server.requests, 'failures': server.failures, 'locations': dict(server.locations)}
+            self.send_json(HTTPStatus.OK, stats)
+            return
+        if url.path != "/forecast":
+            self.send_json(HTTPStatus.NOT_FOUND, {'error': f"no route {url.path}"})
+            return
+
+        query = parse_qs(url.query)
+        location = query.get('location', [''])[0]
+        if not location:
+            self.send_json(HTTPStatus.BAD_REQUEST, {'error': "'location' is required"})
+            return
+        try:
+            days = int(query.get('days', [weather.FORECAST_DAYS])[0])
+        except ValueError:
+            self.send_json(HTTPStatus.BAD_REQUEST, {'error': "'days' must be an integer"})
+            return
+
+        with server.lock:
+            server.requests += 1
+            fail = server.fail_every and server.requests % server.fail_every == 0
+            if fail:
+                server.failures += 1
+            else:
+                server.locations[location] = server.locations.get(location, 0) + 1
+        if fail:
+            self.send_json(HTTPStatus.SERVICE_UNAVAILABLE, {'error': 'simulated failure'})
+            return
+        self.send_json(HTTPStatus.OK, server.provider.forecast(location, days))
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+def start(host="127.0.0.1", port=0, fail_every=0):
+    """Serve on a background thread and return the server; port 0 picks a free port"""
+    server = MockWeatherServer((host, port), fail_every)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve mock weather forecasts for offline testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-every", type=int, default=0, metavar="N",
+                        help="answer every Nth forecast request with 503 to exercise retries")
+    args = parser.parse_args()
+    server = MockWeatherServer((args.host, args.port), args.fail_every)
+    print(f"Serving mock forecasts on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
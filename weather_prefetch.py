@@ -0,0 +1,189 @@
+import argparse
+import asyncio
+import json
+import logging
+import threading
+import time
+
+import crop_data
+import weather
+from languages import TRANSLATIONS
+
+# Background refresh of the forecast for every region the app offers. An
+# asyncio loop on a daemon thread refreshes regions through the process-wide
+# weather.CachedProvider, a bounded number at a time, before their entries
+# expire. The app then reads forecasts with cached_forecast(), which never
+# fetches, so no rerun waits on the network.
+
+logger = logging.getLogger("varun.weather")
+
+# Regions whose cached forecast is older than this are refreshed (a fraction of the cache TTL)
+REFRESH_AGE = weather.DEFAULT_TTL * 0.75
+
+# Seconds between checks for regions due a refresh
+CHECK_INTERVAL = 60.0
+
+# Upstream fetches in flight at once
+MAX_CONCURRENCY = 4
+
+def prefetch_regions():
+    """
+    Every region in crop_data and in the app's region lists. The translated
+    lists follow the English one position for position and forecasts are
+    cached under the English name, so the English list stands for them all.
+    """
+    regions = list(crop_data.REGIONAL_PREFERENCES)
+    for region in TRANSLATIONS['EN']['regions'][1:]:
+        if region not in regions:
+            regions.append(region)
+    return regions
+
+class WeatherPrefetcher:
+    """
+    Keeps the forecasts of `regions` fresh in a weather.CachedProvider
+    (the process-wide provider by default). metrics() reports refresh
+    progress and how stale each region's forecast is.
+    """
+
+    def __init__(self, regions=None, provider=None, refresh_age=REFRESH_AGE,
+                 check_interval=CHECK_INTERVAL, max_concurrency=MAX_CONCURRENCY):
+        self.regions = list(regions or prefetch_regions())
+        self._provider = provider
+        self.refresh_age = refresh_age
+        self.check_interval = check_interval
+        self.max_concurrency = max_concurrency
+        self.cycles = 0
+        self.refreshed = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.last_cycle = None
+        self._thread = None
+        self._loop = None
+        self._stopping = None
+        self._lock = threading.Lock()
+
+    @property
+    def provider(self):
+        return self._provider or weather.get_provider()
+
+    def age(self, region):
+        """Seconds since a region's forecast was fetched, or None if it is not cached"""
+        entry = self.provider.cached(region)
+        return None if entry is None else time.time() - entry[0]
+
+    def due(self):
+        """Regions with no forecast or one older than refresh_age"""
+        return [region for region in self.regions
+                if (age := self.age(region)) is None or age >= self.refresh_age]
+
+    async def _refresh(self, region, semaphore):
+        async with semaphore:
+            with self._lock:
+                self.in_flight += 1
+            try:
+                # Providers block on I/O, so each fetch runs on the default executor
+                await asyncio.to_thread(self.provider.refresh, region)
+                with self._lock:
+                    self.refreshed += 1
+                return True
+            except Exception as e:
+                logger.warning("weather refresh for %s failed: %s", region, e)
+                with self._lock:
+                    self.failures += 1
+                return False
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+
+    async def refresh_due(self):
+        """Refresh every region that is due, at most max_concurrency at a time"""
+        due = self.due()
+        started = time.time()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*(self._refresh(region, semaphore) for region in due))
+        self.cycles += 1
+        self.last_cycle = {'started': started, 'seconds': round(time.time() - started, 3),
+                           'due': len(due), 'failed': results.count(False)}
+        if due:
+            logger.info(json.dumps({'event': 'weather_refresh', **self.last_cycle}))
+
+    async def _run(self):
+        self._stopping = asyncio.Event()
+        while not self._stopping.is_set():
+            try:
+                await self.refresh_due()
+            except Exception:
+                logger.exception("weather refresh cycle failed")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.check_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """Start refreshing on a daemon thread; a second call does nothing"""
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_until_complete, args=(self._run(),),
+                                            name="weather-prefetch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        if self._thread is None:
+            return
+        if self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def metrics(self):
+        """Refresh counters and per-region forecast age in seconds (None = not cached yet)"""
+        ages = {region: self.age(region) for region in self.regions}
+        known = [age for age in ages.values() if age is not None]
+        ttl = getattr(self.provider, 'ttl', None)
+        return {
+            'regions': len(self.regions),
+            'cached': len(known),
+            'expired': sum(1 for age in known if ttl is not None and age >= ttl),
+            'oldest_s': round(max(known), 1) if known else None,
+            'in_flight': self.in_flight,
+            'cycles': self.cycles,
+            'refreshed': self.refreshed,
+            'failures': self.failures,
+            'last_cycle': self.last_cycle,
+            'age_s': {region: None if age is None else round(age, 1) for region, age in ages.items()}
+        }
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+def get_prefetcher():
+    """The process-wide prefetcher, started on first use"""
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = WeatherPrefetcher().start()
+    return _prefetcher
+
+def cached_forecast(location):
+    """
+    The cached forecast for a location, fresh or not, without fetching;
+    None until the prefetcher has fetched it.
+    """
+    get_prefetcher()
+    entry = weather.get_provider().cached(location)
+    return None if entry is None else entry[1]
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch the forecast of every region into the weather cache")
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENCY)
+    parser.add_argument("--all", action="store_true", help="refresh regions that are not due too")
+    args = parser.parse_args()
+    prefetcher = WeatherPrefetcher(max_concurrency=args.max_concurrency, refresh_age=0 if args.all else REFRESH_AGE)
+    asyncio.run(prefetcher.refresh_due())
+    print(json.dumps(prefetcher.metrics(), indent=2))
+
+if __name__ == "__main__":
+    main()